@@ -32,8 +32,72 @@ def cli() -> None:
     show_default=True,
     help="Destination directory for CSV exports.",
 )
-def export(src: Path, out: Path) -> None:
-    export_excel_sheets_to_csv.main(src, out)
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Worker processes used to export workbooks in parallel.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-export every workbook even if it is unchanged since the last run.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="csv",
+    type=click.Choice(["csv", "parquet", "arrow"]),
+    show_default=True,
+    help="Output format; parquet/arrow keep typed columns (requires pyarrow).",
+)
+@click.option(
+    "--compress",
+    default="none",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    show_default=True,
+    help="Compress CSV exports while writing; zstd falls back to gzip without the zstandard package.",
+)
+@click.option(
+    "--sheet-timeout",
+    default=300.0,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Seconds before a sheet export is killed; 0 disables the limit.",
+)
+@click.option(
+    "--progress",
+    is_flag=True,
+    help="Show a per-sheet progress bar sized by each sheet's declared row count.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip sheets already finished by an interrupted export.",
+)
+def export(
+    src: Path,
+    out: Path,
+    workers: int,
+    force: bool,
+    output_format: str,
+    compress: str,
+    sheet_timeout: float,
+    progress: bool,
+    resume: bool,
+) -> None:
+    export_excel_sheets_to_csv.main(
+        src,
+        out,
+        workers=workers,
+        use_cache=not force,
+        output_format=output_format,
+        compress=compress,
+        sheet_timeout=sheet_timeout,
+        progress=progress,
+        resume=resume,
+    )
 
 
 @cli.command()
@@ -70,8 +134,38 @@ def profile(src: Path, out: Path) -> None:
     show_default=True,
     help="Destination directory for transformed outputs.",
 )
-def transform(src: Path, out: Path) -> None:
-    transform_dv_data.main(src, out)
+@click.option(
+    "--steps",
+    default=None,
+    help="Comma-separated transform steps to run, in order (default: all).",
+)
+@click.option(
+    "--skip-step",
+    "skip_steps",
+    multiple=True,
+    type=click.Choice(transform_dv_data.STEP_NAMES),
+    help="Transform step to skip; repeatable.",
+)
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stream the DV file in blocks of this many rows (CSV output only).",
+)
+def transform(
+    src: Path,
+    out: Path,
+    steps: str | None,
+    skip_steps: tuple[str, ...],
+    chunksize: int | None,
+) -> None:
+    transform_dv_data.main(
+        src,
+        out,
+        steps=[step.strip() for step in steps.split(",") if step.strip()] if steps else None,
+        skip_steps=skip_steps,
+        chunksize=chunksize,
+    )
 
 
 @cli.command()
@@ -3,9 +3,14 @@
 from pathlib import Path
 
 from . import ai_data_analyzer
+from . import case_index
+from . import dtype_optimizer
 from . import export_excel_sheets_to_csv
 from . import fix_dv_headers
 from . import map_dv_to_rms_locations
+from . import mapping_registry
+from . import tabular_io
+from . import time_parsing
 from . import transform_dv_data
 from . import verify_transformations
 
@@ -5,9 +5,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import json
 
+from etl_scripts import case_index, dtype_optimizer, tabular_io
+
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 log = logging.getLogger(__name__)
@@ -49,11 +52,11 @@ __all__ = [
 ]
 
 
-def _read_csv(path: Path) -> pd.DataFrame:
-    try:
-        return pd.read_csv(path, engine="pyarrow")
-    except (ImportError, ValueError):
-        return pd.read_csv(path, low_memory=False)
+def _reference_frame(path: Path, kind: str) -> pd.DataFrame:
+    index = case_index.load_case_index(tabular_io.find_csv(path), kind)
+    if index is None:
+        return pd.DataFrame(columns=[case_index.KEY_SOURCES[kind]])
+    return case_index.as_reference_frame(index, kind)
 
 
 def load_sources(
@@ -62,22 +65,19 @@ def load_sources(
     cad_path: Path = DEFAULT_CAD,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     log.info("Loading DV data from %s", dv_path)
-    dv = _read_csv(dv_path)
-    log.info("Loading RMS export from %s", rms_path)
-    rms = _read_csv(rms_path)
-    log.info("Loading CAD export from %s", cad_path)
-    cad = _read_csv(cad_path)
+    dv = tabular_io.read_tabular(tabular_io.find_csv(dv_path))
+    log.info("Loading RMS case index for %s", rms_path)
+    rms = _reference_frame(rms_path, "rms")
+    log.info("Loading CAD case index for %s", cad_path)
+    cad = _reference_frame(cad_path, "cad")
     log.info("Loaded DV=%s rows, RMS=%s rows, CAD=%s rows", len(dv), len(rms), len(cad))
     return dv, rms, cad
 
 
 CASE_PATTERN = re.compile(CONFIG.case_number_pattern)
-
-
-def standardise_case_number(series: pd.Series) -> pd.Series:
-    normalized = series.astype("string").str.strip().str.upper()
-    normalized = normalized.replace({"NAN": pd.NA, "NONE": pd.NA, "NULL": pd.NA, "": pd.NA})
-    return normalized
+# Columns backfill_from_rms/backfill_from_cad fill from other sources; fillna on a
+# categorical rejects values outside its categories, so these stay uncategorised
+BACKFILLED_COLUMNS = ("CaseNumber", "OffenseDate", "Time", "DayOfWeek", "FullAddress", "Narrative", "ReviewedBy")
 
 
 def flag_missing_fields(df: pd.DataFrame) -> pd.DataFrame:
@@ -135,11 +135,18 @@ def backfill_from_rms(df: pd.DataFrame, rms: pd.DataFrame) -> pd.DataFrame:
     df = df.merge(rms_subset, on="CaseNumber", how="left", suffixes=("", "_RMS"))
     source_dates = "Incident Date_RMS" if "Incident Date_RMS" in df.columns else "Incident Date"
     if source_dates in df.columns:
-        df["OffenseDate"] = df["OffenseDate"].fillna(df[source_dates])
+        rms_dates = df[source_dates]
+        if pd.api.types.is_datetime64_any_dtype(rms_dates):
+            # Typed index dates; keep OffenseDate in the ISO text form the DV exports use
+            rms_dates = rms_dates.dt.strftime("%Y-%m-%d")
+        df["OffenseDate"] = df["OffenseDate"].fillna(rms_dates)
     source_times = "Incident Time_RMS" if "Incident Time_RMS" in df.columns else "Incident Time"
     if source_times in df.columns:
         df["Time"] = df["Time"].apply(_coerce_time)
-        df["Time"] = df["Time"].fillna(df[source_times].apply(_coerce_time))
+        rms_times = df[source_times]
+        if not pd.api.types.is_timedelta64_dtype(rms_times):
+            rms_times = rms_times.apply(_coerce_time)
+        df["Time"] = df["Time"].fillna(rms_times)
     source_reviewer = "Officer of Record_RMS" if "Officer of Record_RMS" in df.columns else "Officer of Record"
     if source_reviewer in df.columns:
         reviewer = df[source_reviewer].apply(_extract_reviewer)
@@ -190,7 +197,9 @@ def backfill_from_cad(df: pd.DataFrame, cad: pd.DataFrame) -> pd.DataFrame:
     missing_cols = required - set(cad.columns)
     if missing_cols:
         log.warning("CAD export missing expected columns: %s", ", ".join(sorted(missing_cols)))
-    if "TimeOfCall" in cad.columns:
+    if "TimeOfCall" in cad.columns and pd.api.types.is_datetime64_any_dtype(cad["TimeOfCall"]):
+        cad_parsed = cad["TimeOfCall"]
+    elif "TimeOfCall" in cad.columns:
         cad_parsed = cad["TimeOfCall"].apply(_parse_cad_datetime)
         cad_parsed = pd.to_datetime(cad_parsed, errors="coerce")
     else:
@@ -220,10 +229,39 @@ def backfill_from_cad(df: pd.DataFrame, cad: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def clean_death_counts(df: pd.DataFrame) -> pd.DataFrame:
-    for col in ["JuvDeaths_M", "AdultDeaths_M", "AdultDeaths_F", "JuvDeaths_F"]:
+DEATH_DTYPE = "Int8"
+_DEATH_TOKENS = {"TRUE": 1, "FALSE": 0}
+
+
+def death_counts(series: pd.Series) -> pd.Series:
+    """
+    Coerce a death column to nullable Int8 counts, resolving each distinct value once.
+
+    Booleans (and "True"/"False" text) become 1/0; blank, unparseable, and
+    out-of-range values become <NA>. Columns already typed Int8 are returned as-is.
+    """
+    if series.dtype == DEATH_DTYPE:
+        return series
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(pd.Index(uniques).astype(str), dtype=object).str.strip().str.upper()
+    numbers = pd.to_numeric(text, errors="coerce").astype(float).fillna(text.map(_DEATH_TOKENS))
+    numbers = np.trunc(numbers.to_numpy(dtype=float))
+    out_of_range = (numbers < -128) | (numbers > 127)
+    if out_of_range.any():
+        log.warning(
+            "%s: %s values outside the Int8 range treated as missing",
+            series.name,
+            int(np.isin(codes, np.flatnonzero(out_of_range)).sum()),
+        )
+        numbers[out_of_range] = np.nan
+    lookup = np.append(numbers, np.nan)  # factorize's NA sentinel (-1)
+    return pd.Series(pd.array(lookup[codes], dtype=DEATH_DTYPE), index=series.index, name=series.name)
+
+
+def clean_death_counts(df: pd.DataFrame, config: ValidationConfig = CONFIG) -> pd.DataFrame:
+    for col in config.death_columns:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+            df[col] = death_counts(df[col]).fillna(0)
     return df
 
 
@@ -235,6 +273,18 @@ def drop_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _strip_categories(series: pd.Series) -> pd.Series:
+    """Strip whitespace from a categorical's text categories, merging any that collide."""
+    categories = pd.Index(series.cat.categories)
+    stripped = categories.map(lambda value: value.strip() if isinstance(value, str) else value)
+    new_codes, new_categories = pd.factorize(stripped)
+    codes = series.cat.codes.to_numpy()
+    lookup = np.append(new_codes, -1)  # trailing slot keeps the NA code (-1)
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[codes], categories=new_categories), index=series.index, name=series.name
+    )
+
+
 def final_cleanup(df: pd.DataFrame) -> pd.DataFrame:
     # Drop rows where CaseNumber is entirely missing and contains no other data
     if "CaseNumber" in df.columns:
@@ -261,9 +311,12 @@ def final_cleanup(df: pd.DataFrame) -> pd.DataFrame:
             log.info("Removing %s rows with invalid or missing CaseNumber", int(removed))
         df = df.loc[valid_case_mask].copy()
 
-    # Standardise whitespace on string columns
-    for col in df.select_dtypes(include="object").columns:
+    # Standardise whitespace on string columns; categoricals from the dtype pass
+    # stay categorical, with their categories stripped
+    for col in df.select_dtypes(include=["object"]).columns:
         df[col] = df[col].astype("string").str.strip()
+    for col in df.select_dtypes(include=["category"]).columns:
+        df[col] = _strip_categories(df[col])
 
     if "DayOfWeek" in df.columns:
         df["DayOfWeek"] = df["DayOfWeek"].astype(str).str.strip().str[:3].replace({"nan": pd.NA})
@@ -283,8 +336,11 @@ def run_backfill(
     log_dir: Path = DEFAULT_LOG_DIR,
 ) -> Path:
     dv, rms, cad = load_sources(dv_path, rms_path, cad_path)
+    dv = dtype_optimizer.optimize_dtypes(
+        dv, int_columns=("VictimAge", *CONFIG.death_columns), exclude=BACKFILLED_COLUMNS
+    )
 
-    dv["CaseNumber"] = standardise_case_number(dv["CaseNumber"])
+    dv["CaseNumber"] = case_index.normalize_case_numbers(dv["CaseNumber"])
     dv = flag_missing_fields(dv)
     dv = backfill_from_rms(dv, rms)
     dv = backfill_from_cad(dv, cad)
@@ -381,7 +437,8 @@ def validate_data(df: pd.DataFrame, config: ValidationConfig = CONFIG) -> tuple[
     # Victim age
     if "VictimAge" in df.columns:
         df["VictimAge"] = pd.to_numeric(df["VictimAge"], errors="coerce")
-        out_of_range_mask = ~df["VictimAge"].between(config.min_age, config.max_age)
+        # Missing ages count as out of range (NaN/<NA> never fall between the bounds)
+        out_of_range_mask = ~df["VictimAge"].between(config.min_age, config.max_age).fillna(False).astype(bool)
         out_of_range = int(out_of_range_mask.sum())
         metrics["victim_age_out_of_range"] = out_of_range
         if out_of_range:
@@ -418,7 +475,8 @@ def validate_data(df: pd.DataFrame, config: ValidationConfig = CONFIG) -> tuple[
     # Death columns
     for col in config.death_columns:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+            # No-op for columns clean_death_counts already typed
+            df[col] = death_counts(df[col]).fillna(0)
             negatives = (df[col] < 0).sum()
             metrics[f"negative_{col.lower()}"] = int(negatives)
             if negatives:
@@ -0,0 +1,202 @@
+"""
+Persistent case-number reference index over the RMS and CAD exports.
+
+Each export is parsed once into a small typed table keyed by normalised case
+number (one row per case, first non-null value per column in file order) and
+saved as Parquet in a ``.case_index`` directory beside the source. The index
+records the source's size, mtime and SHA-256 and is rebuilt only when the
+content changes. Without pyarrow the index is still built once per process but
+not persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from etl_scripts import tabular_io
+from etl_scripts.time_parsing import parse_clock_times
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR_NAME = ".case_index"
+KEY_COLUMN = "case_key"
+# Bump when the index layout or column typing changes
+_INDEX_VERSION = 1
+_METADATA_KEY = b"dv_case_index"
+
+# Source column -> index type, per reference export
+INDEX_COLUMNS: Dict[str, Dict[str, str]] = {
+    "rms": {
+        "Incident Date": "date",
+        "Incident Time": "time",
+        "FullAddress": "text",
+        "FullAddress2": "text",
+        "Address": "text",
+        "Narrative": "text",
+        "Officer of Record": "text",
+    },
+    "cad": {
+        "Time of Call": "datetime",
+        "DayofWeek": "text",
+        "FullAddress2": "text",
+        "CADNotes": "text",
+    },
+}
+KEY_SOURCES = {"rms": "Case Number", "cad": "ReportNumberNew"}
+
+_lock = threading.Lock()
+_memo: Dict[Tuple[Path, str], Tuple[dict, pd.DataFrame]] = {}
+
+
+def normalize_case_numbers(series: pd.Series) -> pd.Series:
+    """Strip and upper-case case numbers; blanks and null tokens become <NA>."""
+    normalized = series.astype("string").str.strip().str.upper()
+    return normalized.replace({"NAN": pd.NA, "NONE": pd.NA, "NULL": pd.NA, "": pd.NA})
+
+
+def first_per_case(frame: pd.DataFrame, key_column: str) -> pd.DataFrame:
+    """
+    Collapse ``frame`` to one row per normalised ``key_column`` value, indexed by
+    it, taking each column's first non-null value in row order. Rows without a
+    case number are dropped.
+    """
+    rows = frame.drop(columns=key_column).assign(**{KEY_COLUMN: normalize_case_numbers(frame[key_column])})
+    return rows.dropna(subset=[KEY_COLUMN]).groupby(KEY_COLUMN, sort=False).first()
+
+
+def as_reference_frame(index: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """Flatten an index back to the export's column names, with the normalised key as its case-number column."""
+    return index.rename_axis(KEY_SOURCES[kind]).reset_index()
+
+
+def _file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _source_state(path: Path) -> dict:
+    st = path.stat()
+    return {"version": _INDEX_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def index_path(source: Path, kind: str) -> Path:
+    return source.parent / INDEX_DIR_NAME / f"{source.name}.{kind}.parquet"
+
+
+def build_case_index(source: Path, kind: str) -> Optional[pd.DataFrame]:
+    """Parse ``source`` into a typed frame indexed by normalised case number."""
+    columns = INDEX_COLUMNS[kind]
+    key_source = KEY_SOURCES[kind]
+    # The C parser keeps text verbatim with dtype=str; the pyarrow engine infers
+    # types first (case numbers like 1234 would come back as "1234.0")
+    raw = tabular_io.read_tabular(source, columns={key_source, *columns}, engine="c", dtype=str)
+    if key_source not in raw.columns:
+        logger.warning("Reference file %s has no %s column; cannot index it.", source, key_source)
+        return None
+    typed = pd.DataFrame({key_source: raw[key_source]})
+    for column in raw.columns.drop(key_source):
+        kind_of = columns[column]
+        if kind_of == "date":
+            typed[column] = pd.to_datetime(raw[column], errors="coerce", format="mixed").dt.normalize()
+        elif kind_of == "datetime":
+            typed[column] = pd.to_datetime(raw[column], errors="coerce", format="mixed")
+        elif kind_of == "time":
+            typed[column] = parse_clock_times(raw[column])
+        else:
+            typed[column] = raw[column].astype("string")
+    index = first_per_case(typed, key_source)
+    logger.info("Indexed %s: %s rows -> %s cases", source, len(raw), len(index))
+    return index
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None, None
+    return pa, pq
+
+
+def _stored_state(path: Path, pq) -> Optional[dict]:
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[_METADATA_KEY])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _read_index(path: Path, pq) -> pd.DataFrame:
+    frame = pq.read_table(path).to_pandas()
+    frame.index = frame.index.astype("string")
+    return frame
+
+
+def _save(frame: pd.DataFrame, path: Path, state: dict, pa, pq) -> None:
+    table = pa.Table.from_pandas(frame)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _METADATA_KEY: json.dumps(state).encode("utf-8")}
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".part")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+def load_case_index(source: Path, kind: str) -> Optional[pd.DataFrame]:
+    """
+    Return the ``kind`` ("rms" or "cad") index for ``source``, building or
+    refreshing the on-disk copy when the source changed. Returns None when the
+    source is missing or has no case-number column. Callers must not mutate
+    the returned frame; it is shared within the process.
+    """
+    source = Path(source)
+    if not source.exists():
+        logger.warning("Reference file %s not found; skipping backfill.", source)
+        return None
+    memo_key = (source.resolve(), kind)
+    with _lock:
+        state = _source_state(source)
+        cached = _memo.get(memo_key)
+        if cached is not None and all(cached[0].get(k) == v for k, v in state.items()):
+            return cached[1]
+
+        pa, pq = _pyarrow()
+        target = index_path(source, kind)
+        stored = _stored_state(target, pq) if pq is not None and target.exists() else None
+        frame = None
+        if stored is not None:
+            if all(stored.get(k) == v for k, v in state.items()):
+                frame = _read_index(target, pq)
+                state = stored
+            else:
+                state["sha256"] = _file_sha256(source)
+                if stored.get("version") == state["version"] and stored.get("sha256") == state["sha256"]:
+                    # Touched but unchanged: keep the index, refresh its recorded stat
+                    frame = _read_index(target, pq)
+                    _save(frame, target, state, pa, pq)
+        if frame is None:
+            state.setdefault("sha256", _file_sha256(source))
+            frame = build_case_index(source, kind)
+            if frame is None:
+                return None
+            if pq is not None:
+                try:
+                    _save(frame, target, state, pa, pq)
+                except OSError as e:
+                    logger.warning("Could not write case index %s: %s", target, e)
+            else:
+                logger.debug("pyarrow unavailable; case index for %s is kept in memory only", source)
+        _memo[memo_key] = (state, frame)
+        return frame
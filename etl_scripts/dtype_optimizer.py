@@ -0,0 +1,100 @@
+"""
+Shared dtype pass for a freshly loaded DV frame that a stage holds and aggregates
+(backfill_dv runs it right after load).
+
+Low-cardinality text columns (race/ethnicity codes, DayOfWeek, PDZone,
+Disposition, Incident, Officer, ...) become ``category`` and whole-number
+count columns become the smallest nullable integer type that holds them. The
+memory saved is logged per column.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# VictimAge plus backfill_dv.CONFIG.death_columns
+INT_COLUMNS = ("VictimAge", "JuvDeaths_M", "AdultDeaths_M", "AdultDeaths_F", "JuvDeaths_F")
+# A text column is categorised when distinct values are at most this share of its rows
+MAX_UNIQUE_RATIO = 0.5
+_NULLABLE_INTS = ("Int8", "Int16", "Int32", "Int64")
+
+
+def smallest_int_dtype(series: pd.Series) -> Optional[str]:
+    """
+    Smallest nullable integer dtype that holds ``series`` losslessly, or None when
+    it has fractional or non-numeric values.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return "Int8"
+    numbers = pd.to_numeric(series, errors="coerce")
+    if numbers.isna().sum() != series.isna().sum():
+        return None
+    values = numbers.dropna().to_numpy(dtype=float)
+    if not len(values):
+        return "Int8"
+    if not np.array_equal(values, np.round(values)):
+        return None
+    low, high = values.min(), values.max()
+    for dtype in _NULLABLE_INTS:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return dtype
+    return None
+
+
+def _is_low_cardinality_text(series: pd.Series, max_unique_ratio: float) -> bool:
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return False
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    non_null = series.notna().sum()
+    if not non_null or pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return False
+    return series.nunique(dropna=True) <= max_unique_ratio * non_null
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    int_columns: Iterable[str] = INT_COLUMNS,
+    exclude: Iterable[str] = (),
+    max_unique_ratio: float = MAX_UNIQUE_RATIO,
+) -> pd.DataFrame:
+    """
+    Categorise low-cardinality text columns and downcast ``int_columns``.
+
+    Columns in ``exclude`` are left alone (use it for merge keys and columns a
+    stage later fills with values from elsewhere). Integer columns holding
+    values that would not survive the cast are kept as they are.
+    """
+    skip = set(exclude)
+    int_columns = [col for col in int_columns if col in df.columns and col not in skip]
+    saved_total = 0
+    for col in df.columns:
+        if col in skip:
+            continue
+        series = df[col]
+        if col in int_columns:
+            target = smallest_int_dtype(series)
+            if target is None or series.dtype == target:
+                continue
+            converted = pd.to_numeric(series, errors="coerce").astype(target)
+        elif _is_low_cardinality_text(series, max_unique_ratio):
+            converted = series.astype("category")
+        else:
+            continue
+        before = series.memory_usage(index=False, deep=True)
+        after = converted.memory_usage(index=False, deep=True)
+        df[col] = converted
+        saved_total += before - after
+        logger.info(
+            "%s: %s -> %s, %.1f KB -> %.1f KB", col, series.dtype, converted.dtype, before / 1024, after / 1024
+        )
+    if saved_total:
+        logger.info("Dtype optimisation saved %.2f MB", saved_total / 1024**2)
+    return df
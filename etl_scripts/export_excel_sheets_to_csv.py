@@ -3,21 +3,29 @@
 # Changes: Added batch processing, automatic folder detection, improved logging
 
 import argparse
+import copy
+import io
 import os
 import re
 import json
 import hashlib
+import itertools
 import time
+import zipfile
+import xml.etree.ElementTree as ET
 import psutil
 from datetime import datetime, time as dtime, date, timedelta as dtdelta
 import fnmatch
+import gzip
 import csv
 import logging
+import multiprocessing
 import signal
+import sys
 from pathlib import Path
 from types import SimpleNamespace
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
@@ -26,6 +34,8 @@ warnings.filterwarnings("ignore", category=UserWarning, module="dateutil.parser"
 from openpyxl import load_workbook
 from openpyxl.utils.cell import range_boundaries, get_column_letter
 from openpyxl.utils import column_index_from_string
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+import numpy as np
 import pandas as pd
 
 # Custom Exceptions
@@ -35,37 +45,9 @@ class ExportTimeoutError(Exception):
 class ExportError(Exception):
     pass
 
-# Timeout Handler (Windows compatible)
-import threading
-
-def timeout_handler(timeout_seconds):
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            result = [None]
-            exception = [None]
-            
-            def target():
-                try:
-                    result[0] = func(*args, **kwargs)
-                except Exception as e:
-                    exception[0] = e
-            
-            thread = threading.Thread(target=target)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout_seconds)
-            
-            if thread.is_alive():
-                raise ExportTimeoutError(f"Export timed out after {timeout_seconds} seconds")
-            
-            if exception[0]:
-                raise exception[0]
-            
-            return result[0]
-        return wrapper
-    return decorator
-
 _TIME_RE = re.compile(r"^\s*\d{1,2}:\d{2}(:\d{2})?\s*$")
+_WRITE_BATCH_ROWS = 5000
+_PROGRESS_ROWS = 1000
 
 def sanitize_filename(name: str, used: set) -> str:
     fn = re.sub(r'[<>:"/\\|?*\x00-\x1F]', '_', name).strip().strip('.')
@@ -78,36 +60,179 @@ def sanitize_filename(name: str, used: set) -> str:
     used.add(fn.lower())
     return fn
 
-def get_used(ws):
+def _list_sheet_names(xlsx_path):
+    """Read sheet names from xl/workbook.xml without loading the workbook"""
     try:
-        dim = ws.calculate_dimension()
-    except ValueError:
-        # Handle unsized worksheets
-        dim = ws.calculate_dimension(force=True)
-    
-    if dim in ("A1:A1", None):
+        with zipfile.ZipFile(xlsx_path) as zf:
+            root = ET.fromstring(zf.read("xl/workbook.xml"))
+    except (zipfile.BadZipFile, KeyError, OSError, ET.ParseError):
+        return []
+    return [el.get("name") for el in root.iter() if el.tag.endswith("}sheet")]
+
+def _filter_sheets(sheet_names, args):
+    """Apply --include/--exclude substring patterns unless all sheets are requested"""
+    filtered_sheets = []
+    for sheet_name in sheet_names:
+        if not args.all_sheets:
+            if args.exclude and any(pat.lower() in sheet_name.lower() for pat in args.exclude):
+                continue
+            if args.include and not any(pat.lower() in sheet_name.lower() for pat in args.include):
+                continue
+        filtered_sheets.append(sheet_name)
+    return filtered_sheets
+
+def plan_output_names(xlsx_path, sheet_names, used_names):
+    """
+    Map each sheet to (sanitized_name, csv_name). Reserving names in a shared
+    used_names set keeps collisions across workbooks deterministic.
+    """
+    plan = {}
+    if len(sheet_names) == 1:
+        # If only one sheet is being exported, use the workbook base name
+        stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+        csv_stem = stem
+        i = 2
+        while csv_stem.lower() in used_names:
+            csv_stem = f"{stem}_{i}"
+            i += 1
+        used_names.add(csv_stem.lower())
+        plan[sheet_names[0]] = (sanitize_filename(sheet_names[0], set()), f"{csv_stem}.csv")
+        return plan
+    for sheet_name in sheet_names:
+        safe = sanitize_filename(sheet_name, used_names)
+        plan[sheet_name] = (safe, f"{safe}.csv")
+    return plan
+
+def get_used(ws, extent=None):
+    """
+    Used extent (max_row, max_col) of a worksheet. Given the extent dict that
+    _iter_used_rows filled while the sheet was exported, this is the trimmed
+    extent of the rows already streamed; otherwise it is the declared dimension
+    ((0, 0) when unsized). The sheet is never scanned for it.
+    """
+    if extent is not None:
+        return extent["rows"], extent["cols"]
+    declared = _declared_range(ws)
+    if declared in (None, "A1:A1"):
         return 0, 0
-    min_c, min_r, max_c, max_r = range_boundaries(dim)
+    _, _, max_c, max_r = range_boundaries(declared)
     return max_r, max_c
 
+def _declared_range(ws):
+    """The <dimension> ref a worksheet declares, or None when it is unsized"""
+    try:
+        return ws.calculate_dimension()
+    except ValueError:
+        return None
+
+def _used_range_ref(max_r, max_c):
+    return f"A1:{get_column_letter(max_c)}{max_r}" if max_r and max_c else None
+
+def _iter_used_rows(ws, extent, hidden_rows=None, progress=None):
+    """
+    Yield a worksheet's non-blank rows with trailing empty cells stripped and
+    record the true used extent in extent["rows"] / extent["cols"].
+
+    Rows are read from an unsized copy of a read-only sheet, so sheets
+    formatted out to XFD1048576 are not padded to that width and never need a
+    force=True scan, while ws itself keeps its declared dimensions; trailing
+    runs of formatting-only rows and columns simply yield nothing.
+    Rows whose 1-based numbers are in hidden_rows are skipped. A tqdm
+    progress bar, if given, advances with source rows read.
+    """
+    if hasattr(ws, "reset_dimensions"):
+        ws = copy.copy(ws)
+        ws.reset_dimensions()
+    skip = []
+    if hidden_rows is not None and len(hidden_rows):
+        flags = np.zeros(int(hidden_rows.max()) + 1, dtype=bool)
+        flags[hidden_rows] = True
+        skip = flags.tolist()
+    n_skip = len(skip)
+    reported = 0
+    for r_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
+        if progress is not None and r_idx - reported >= _PROGRESS_ROWS:
+            progress.update(r_idx - reported)
+            reported = r_idx
+        width = len(row)
+        while width and (row[width - 1] is None or row[width - 1] == ""):
+            width -= 1
+        if not width:
+            continue
+        extent["rows"] = r_idx
+        if width > extent["cols"]:
+            extent["cols"] = width
+        if r_idx < n_skip and skip[r_idx]:
+            continue
+        yield row[:width] if width < len(row) else row
+
+def _parse_sheet_pandas(excel_file, sheet_name, hidden_rows=None):
+    """
+    Parse a sheet with pandas minus its hidden rows (1-based numbers in hidden_rows).
+
+    Returns the frame and the sheet's used extent counted as _iter_used_rows
+    counts it: row 1 through the last non-blank row, hidden rows included, so
+    every engine reports the same used_range. Leading hidden rows are skipped
+    at parse time so the first visible row is the header; later ones are parsed
+    for the extent and masked out.
+    """
+    hidden = set(hidden_rows.tolist()) if hidden_rows is not None else set()
+    lead = 0
+    while lead + 1 in hidden:
+        lead += 1
+    df = excel_file.parse(sheet_name, keep_default_na=False, skiprows=lead or None)
+    extent = {"rows": lead + 1 + len(df) if len(df.columns) else 0, "cols": len(df.columns)}
+    if len(hidden) > lead:
+        # Data row i sits on sheet row lead + 2 + i (after the header)
+        sheet_rows = np.arange(len(df)) + lead + 2
+        df = df[~np.isin(sheet_rows, hidden_rows)].reset_index(drop=True)
+    return df, extent
+
+def _drop_hidden_columns(df, hidden_cols):
+    """Project a frame onto its visible columns; hidden_cols are 0-based sheet positions"""
+    if hidden_cols is None or not len(hidden_cols):
+        return df
+    visible = ~np.isin(np.arange(df.shape[1]), hidden_cols)
+    return df if visible.all() else df.iloc[:, visible]
+
+def _gate_columns(af_columns, hidden_cols=None, af_gate_visible_only=False):
+    """0-based --af-columns positions, minus hidden columns when only visible cells count"""
+    af_cols = [c - 1 for c in _parse_af_columns(af_columns)]
+    if af_gate_visible_only and hidden_cols is not None and len(hidden_cols):
+        hidden = set(hidden_cols.tolist())
+        af_cols = [c for c in af_cols if c not in hidden]
+    return af_cols
+
 def get_file_hash(path):
     if not os.path.exists(path):
         return None
     hasher = hashlib.sha256()
     with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hasher.update(chunk)
     return hasher.hexdigest()
 
-def get_adaptive_chunksize(file_size, available_memory):
+# Rough in-memory cost of one cell while a block is held: the raw value in its row
+# tuple, its slot in the object DataFrame, and the formatted copy.
+_EST_CELL_BYTES = 200
+# Workbooks at least this large read sheets block-wise even on the pandas engine
+_CHUNKED_MIN_BYTES = 50 * 1024 * 1024
+
+def get_adaptive_chunksize(file_size, available_memory, n_cols=None):
+    """Rows per block: file-size tier, capped so one block fits in half of available memory (MB)"""
     memory_threshold = available_memory * 0.5  # Use 50% of available memory
     if file_size > 100 * 1024 * 1024:
-        return 1000
+        rows = 1000
     elif file_size > 50 * 1024 * 1024:
-        return 2000
+        rows = 2000
     elif file_size > 10 * 1024 * 1024:
-        return 5000
-    return 10000
+        rows = 5000
+    else:
+        rows = 10000
+    if n_cols:
+        budget_rows = int(memory_threshold * 1024 * 1024 / (n_cols * _EST_CELL_BYTES))
+        rows = max(100, min(rows, budget_rows))
+    return rows
 
 def _parse_af_columns(spec: str):
     """
@@ -129,23 +254,21 @@ def _parse_af_columns(spec: str):
     return sorted(set(cols))
 
 def _to_text(value, date_fmt="%Y-%m-%d", dt_fmt="%Y-%m-%d %H:%M:%S", t_fmt="%H:%M:%S"):
-    if value is None:
+    if value is None or value is pd.NaT:
+        return ""
+    if isinstance(value, float) and value != value:
         return ""
     if isinstance(value, (int, float)):
         return value
-# Handle pandas time-only values that may come as timedelta
-    try:
-        import pandas as _pd
-        if isinstance(value, getattr(_pd, 'Timedelta', ())) or isinstance(value, dtdelta):
-            total_seconds = int(value.total_seconds())
-            # Normalize to within a day
-            total_seconds = total_seconds % (24 * 3600)
-            hh = total_seconds // 3600
-            mm = (total_seconds % 3600) // 60
-            ss = total_seconds % 60
-            return f"{hh:02d}:{mm:02d}:{ss:02d}"
-    except Exception:
-        pass
+    # Handle pandas time-only values that may come as timedelta (pd.Timedelta subclasses timedelta)
+    if isinstance(value, dtdelta):
+        total_seconds = int(value.total_seconds())
+        # Normalize to within a day
+        total_seconds = total_seconds % (24 * 3600)
+        hh = total_seconds // 3600
+        mm = (total_seconds % 3600) // 60
+        ss = total_seconds % 60
+        return f"{hh:02d}:{mm:02d}:{ss:02d}"
     if isinstance(value, datetime):
         # If Excel stored a time-only value, the date part is often 1899-12-30
         if value.date().isoformat() == "1899-12-30":
@@ -165,177 +288,1059 @@ def _to_text(value, date_fmt="%Y-%m-%d", dt_fmt="%Y-%m-%d %H:%M:%S", t_fmt="%H:%
         return dtime(parts[0], parts[1], parts[2]).strftime(t_fmt)
     return str(value)
 
-def _get_used_range(data):
-    """Get used range for both openpyxl worksheets and pandas DataFrames"""
+def _get_used_range(data, extent=None):
+    """Get used range for both openpyxl worksheets (see get_used) and pandas DataFrames"""
     if hasattr(data, 'calculate_dimension'):  # openpyxl worksheet
-        try:
-            dim = data.calculate_dimension()
-        except ValueError:
-            # Handle unsized worksheets
-            dim = data.calculate_dimension(force=True)
-        
-        if dim in ("A1:A1", None):
-            return 0, 0
-        min_c, min_r, max_c, max_r = range_boundaries(dim)
-        return max_r, max_c
+        return get_used(data, extent)
     else:  # pandas DataFrame
         if data.empty:
             return 0, 0
         return len(data), len(data.columns)
 
 
-def _iter_rows_pandas(df, visible_only, date_fmt, dt_fmt, t_fmt, af_columns, min_af_nonempty, af_gate_visible_only):
-    """Iterate over pandas DataFrame rows for export"""
-    af_cols = _parse_af_columns(af_columns)
+_EXCEL_TIME_ONLY_DATE = pd.Timestamp("1899-12-30")
+
+def _hms_strings(seconds):
+    """Format an int64 array of seconds-within-a-day as zero-padded HH:MM:SS strings"""
+    hh = pd.Series(seconds // 3600).astype(str).str.zfill(2)
+    mm = pd.Series((seconds % 3600) // 60).astype(str).str.zfill(2)
+    ss = pd.Series(seconds % 60).astype(str).str.zfill(2)
+    return (hh + ":" + mm + ":" + ss).to_numpy(dtype=object)
+
+def _format_column(series, date_fmt, dt_fmt, t_fmt):
+    """
+    Format a whole column at once, mirroring _to_text. The column kind (datetime,
+    timedelta, numeric, text) is detected once; only mixed-type object columns
+    fall back to per-cell formatting.
+    """
+    n = len(series)
+    out = np.full(n, "", dtype=object)
+    if n == 0:
+        return out
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        valid = series.notna().to_numpy()
+        if valid.any():
+            day = series.dt.normalize()
+            time_only = (day == _EXCEL_TIME_ONLY_DATE).to_numpy() & valid
+            midnight = (series == day).to_numpy() & valid & ~time_only
+            other = valid & ~time_only & ~midnight
+            for mask, fmt in ((time_only, t_fmt), (midnight, date_fmt), (other, dt_fmt)):
+                if mask.any():
+                    out[mask] = series[mask].dt.strftime(fmt).to_numpy(dtype=object)
+        return out
+
+    if pd.api.types.is_timedelta64_dtype(series):
+        valid = series.notna().to_numpy()
+        if valid.any():
+            # Truncate toward zero like int(td.total_seconds()), then normalize to within a day
+            seconds = np.trunc(series[valid].dt.total_seconds().to_numpy()).astype(np.int64) % (24 * 3600)
+            out[valid] = _hms_strings(seconds)
+        return out
+
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        valid = series.notna().to_numpy()
+        out[valid] = series[valid].to_numpy(dtype=object)
+        return out
+
+    values = series.to_numpy(dtype=object)
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "empty":
+        return out
+    valid = pd.notna(values)
+    if kind in ("integer", "floating", "mixed-integer-float", "decimal", "boolean"):
+        out[valid] = values[valid]
+        return out
+    if kind == "string":
+        out[valid] = values[valid]
+        time_like = pd.Series(values).str.match(_TIME_RE).to_numpy(dtype=bool, na_value=False)
+        for i in np.flatnonzero(time_like):
+            out[i] = _to_text(values[i], date_fmt, dt_fmt, t_fmt)
+        return out
+    if kind == "datetime":
+        # Raw datetime objects (e.g. from openpyxl rows); vectorize when they fit datetime64
+        try:
+            converted = pd.Series(pd.to_datetime(values))
+        except (ValueError, TypeError, OverflowError):
+            converted = None
+        if converted is not None and pd.api.types.is_datetime64_any_dtype(converted):
+            return _format_column(converted, date_fmt, dt_fmt, t_fmt)
+
+    out[:] = [_to_text(v, date_fmt, dt_fmt, t_fmt) for v in values]
+    return out
+
+def _format_frame_rows(df, keep, date_fmt, dt_fmt, t_fmt):
+    """Format a frame column by column and yield its kept, non-blank rows as tuples"""
+    if not keep.all():
+        # Rows failing the gate are dropped before any cell is formatted
+        df = df.iloc[np.flatnonzero(keep)]
+    n_rows, n_cols = df.shape
+    columns = [_format_column(df.iloc[:, i], date_fmt, dt_fmt, t_fmt) for i in range(n_cols)]
+
+    # Drop rows where every formatted cell is empty
+    non_blank = np.zeros(n_rows, dtype=bool)
+    for col in columns:
+        non_blank |= col != ""
+    rows_idx = np.flatnonzero(non_blank)
+
+    for start in range(0, len(rows_idx), _WRITE_BATCH_ROWS):
+        idx = rows_idx[start:start + _WRITE_BATCH_ROWS]
+        yield from zip(*(col[idx] for col in columns))
+
+def _sample_rss(stats):
+    if stats is not None:
+        stats["peak_rss"] = max(stats.get("peak_rss", 0), psutil.Process().memory_info().rss)
+
+def _iter_rows_pandas(df, visible_only, date_fmt, dt_fmt, t_fmt, af_columns, min_af_nonempty, af_gate_visible_only, stats=None,
+                      hidden_cols=None):
+    """
+    Iterate over pandas DataFrame rows for export, formatting column by column.
+    Hidden rows are expected to be skipped at parse time; hidden_cols are
+    dropped here when visible_only is set.
+    """
     max_r, max_c = _get_used_range(df)
     if max_r == 0 or max_c == 0:
         return
-    
+
+    # A-F gate: one mask over the selected columns, evaluated before any formatting
+    keep = _af_gate_mask(df, _gate_columns(af_columns, hidden_cols, af_gate_visible_only), min_af_nonempty)
+    include_headers = getattr(df, "_include_headers", False)
+    if visible_only:
+        df = _drop_hidden_columns(df, hidden_cols)
+
     # Emit header row when using pandas engine
-    if getattr(df, "_include_headers", False):
+    if include_headers:
         yield [str(col) for col in df.columns]
 
-    for r, row in enumerate(df.itertuples(index=False), 1):
+    _sample_rss(stats)
+    yield from _format_frame_rows(df, keep, date_fmt, dt_fmt, t_fmt)
+    _sample_rss(stats)
+
+def _iter_blocks_openpyxl(rows, chunksize):
+    """Yield lists of up to chunksize raw row tuples from a row iterator"""
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) >= chunksize:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def _iter_rows_openpyxl(rows, visible_only, date_fmt, dt_fmt, t_fmt, af_columns, min_af_nonempty, af_gate_visible_only,
+                        chunksize=10000, stats=None, hidden_cols=None):
+    """
+    Stream trimmed worksheet rows (see _iter_used_rows) in blocks of chunksize rows.
+    Only one block is held at a time, so memory stays bounded by the block size;
+    each block is formatted column-wise like the pandas path and padded to the
+    widest row seen so far. stats["widened"] is set if a later block turned out
+    wider than rows already written. With visible_only, hidden_cols are
+    projected out of every block after the gate runs.
+    """
+    af_cols = _gate_columns(af_columns, hidden_cols, af_gate_visible_only)
+    width = 0
+
+    _sample_rss(stats)
+    for block in _iter_blocks_openpyxl(rows, chunksize):
+        # object dtype keeps raw cell values (no int->float upcasting around blanks)
+        frame = pd.DataFrame(block, dtype=object)
+        if frame.shape[1] > width:
+            if width and stats is not None:
+                stats["widened"] = True
+            width = frame.shape[1]
+        elif frame.shape[1] < width:
+            frame = frame.reindex(columns=range(width))
+
+        keep = _af_gate_mask(frame, af_cols, min_af_nonempty)
         if visible_only:
-            # For pandas, we can't easily check row/column visibility
-            # This would require additional metadata
-            pass
-            
-        # A-F gate logic
-        non_empty = 0
-        af_values = []
-        for c in af_cols:
-            if c < len(row):
-                val = row[c]
-                af_values.append(val)
-                if pd.notna(val) and val != "":
-                    non_empty += 1
-        
-        if non_empty < min_af_nonempty:
-            continue
-        
-        # Convert row to text
-        row_out = []
-        for val in row:
-            formatted_val = _to_text(val, date_fmt, dt_fmt, t_fmt)
-            row_out.append(formatted_val)
-        
-        if row_out and any(v != "" for v in row_out):
-            yield row_out
+            frame = _drop_hidden_columns(frame, hidden_cols)
+
+        yield from _format_frame_rows(frame, keep, date_fmt, dt_fmt, t_fmt)
+        _sample_rss(stats)
+
+def _pad_csv(path, width, encoding, bom, stats=None, compression=None):
+    """Rewrite a CSV so every row has width cells; used when trimming found a wider row late in a sheet"""
+    tmp_path = path + ".pad"
+    read_encoding = "utf-8-sig" if encoding.lower().replace("-", "") == "utf8" else encoding
+    with _open_csv_text(path, read_encoding, compression) as fh:
+        padded = (row + [""] * (width - len(row)) for row in csv.reader(fh))
+        result = _stream_write_csv(tmp_path, padded, encoding, bom, stats, compression)
+    os.replace(tmp_path, path)
+    return result
+
+class _HashingFile(io.RawIOBase):
+    """Raw binary sink that updates a SHA-256 digest and byte count as bytes pass through"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.hasher = hashlib.sha256()
+        self.bytes_written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        n = self._raw.write(b)
+        self.hasher.update(memoryview(b)[:n])
+        self.bytes_written += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+# CSV compression codecs (--compress) and the extension appended to .csv
+_CSV_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+def _csv_compression(args):
+    """Effective --compress codec for CSV output: None, "gzip", or "zstd" (gzip if zstandard is missing)"""
+    codec = getattr(args, "compress", None)
+    if codec in (None, "", "none") or getattr(args, "output_format", "csv") != "csv":
+        return None
+    if codec == "zstd" and _zstandard() is None:
+        return "gzip"
+    return codec
+
+def _compressed_writer(raw, compression):
+    """Wrap a binary sink so bytes are compressed on their way into it"""
+    if compression == "gzip":
+        # mtime=0 keeps the gzip header, and so the file digest, identical across runs
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    return raw
 
-def _stream_write_csv(path, rows_iterable, encoding: str, bom: bool):
+def _open_csv_text(path, encoding, compression=None):
+    """Open a (possibly compressed) CSV for reading as text"""
+    if compression == "gzip":
+        return gzip.open(path, "rt", encoding=encoding, newline="")
+    if compression == "zstd":
+        reader = _zstandard().ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(reader, encoding=encoding, newline="")
+    return open(path, newline="", encoding=encoding)
+
+def _stream_write_csv(path, rows_iterable, encoding: str, bom: bool, stats=None, compression=None):
+    """
+    Write rows to CSV, compressed on the fly with gzip/zstd if requested; returns
+    (rows, max_cols, sha256, bytes) of the file as written to disk, computed while writing.
+    Time spent encoding, compressing, hashing and writing batches is added to stats["write_seconds"].
+    """
     os.makedirs(os.path.dirname(path), exist_ok=True)
     final_encoding = ("utf-8-sig" if bom and encoding.lower().replace("-", "") == "utf8" else encoding)
     row_count = 0
     max_cols_seen = 0
-    with open(path, "w", encoding=final_encoding, newline="") as f:
+    write_seconds = 0.0
+    sink = _HashingFile(open(path, "wb"))
+    stream = _compressed_writer(sink, compression)
+    with io.TextIOWrapper(io.BufferedWriter(stream), encoding=final_encoding, newline="") as f:
         writer = csv.writer(f)
+        batch = []
         for row in rows_iterable:
-            if row is None:
-                row = []
-            writer.writerow(row)
-            row_count += 1
-            if isinstance(row, (list, tuple)):
-                if len(row) > max_cols_seen:
-                    max_cols_seen = len(row)
-    return row_count, max_cols_seen
-
-def process_excel_file(xlsx_path, out_dir, args, logger):
-    """Process a single Excel file and return results"""
+            batch.append(row if row is not None else [])
+            if len(batch) >= _WRITE_BATCH_ROWS:
+                started = time.perf_counter()
+                writer.writerows(batch)
+                write_seconds += time.perf_counter() - started
+                row_count += len(batch)
+                max_cols_seen = max(max_cols_seen, max(map(len, batch)))
+                batch = []
+        started = time.perf_counter()
+        if batch:
+            writer.writerows(batch)
+            row_count += len(batch)
+            max_cols_seen = max(max_cols_seen, max(map(len, batch)))
+        f.flush()
+        write_seconds += time.perf_counter() - started
+    # Compressors finish their stream on close but leave the underlying file open
+    sink.close()
+    if stats is not None:
+        stats["write_seconds"] = stats.get("write_seconds", 0.0) + write_seconds
+    return row_count, max_cols_seen, sink.hasher.hexdigest(), sink.bytes_written
+
+# Columnar output formats and their file extensions (require pyarrow)
+_COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ExportError("pyarrow is required for --format parquet/arrow; install it or export to csv") from e
+    return pa
+
+def _unique_headers(header):
+    """Name header cells the way pandas.read_excel does: blanks become 'Unnamed: i', repeats get '.n'"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or str(value).strip() == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _sheet_frame_openpyxl(rows):
+    """Build a DataFrame from trimmed worksheet rows, using the first row as the header"""
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    records = list(rows)
+    width = max(len(header), max(map(len, records), default=0))
+    records = [r + (None,) * (width - len(r)) if len(r) < width else r for r in records]
+    header = header + (None,) * (width - len(header))
+    return pd.DataFrame.from_records(records, columns=_unique_headers(header))
+
+def _typed_frame(df, date_fmt, dt_fmt, t_fmt):
+    """
+    Give each object column a single Arrow-friendly type: blanks become nulls,
+    uniform columns are converted to numeric/datetime/boolean/string, and
+    genuinely mixed columns are rendered as text with the CSV formatter.
+    """
+    columns = {}
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        if series.dtype == object:
+            series = series.where(~series.eq(""), None)
+            kind = pd.api.types.infer_dtype(series, skipna=True)
+            if kind == "integer":
+                series = pd.to_numeric(series).astype("Int64")
+            elif kind in ("floating", "mixed-integer-float", "decimal"):
+                series = pd.to_numeric(series)
+            elif kind in ("datetime", "datetime64", "date"):
+                series = pd.to_datetime(series)
+            elif kind == "timedelta":
+                series = pd.to_timedelta(series)
+            elif kind == "boolean":
+                series = series.astype("boolean")
+            elif kind in ("string", "empty"):
+                series = series.astype("string")
+            elif kind != "time":
+                text = pd.Series(_format_column(series, date_fmt, dt_fmt, t_fmt), index=series.index)
+                series = text.astype(str).where(series.notna()).astype("string")
+        columns[str(name)] = series
+    return pd.DataFrame(columns, index=df.index)
+
+def _af_gate_mask(df, af_cols, min_af_nonempty):
+    """Boolean mask of rows with at least min_af_nonempty non-empty cells among 0-based af_cols"""
+    if min_af_nonempty <= 0:
+        return np.ones(len(df), dtype=bool)
+    cols = [c for c in af_cols if c < df.shape[1]]
+    if not cols:
+        return np.zeros(len(df), dtype=bool)
+    values = df.iloc[:, cols].to_numpy(dtype=object)
+    missing = pd.isna(values)
+    # Blank out nulls first so the "" comparison only ever sees real values
+    values[missing] = None
+    filled = ~missing & (values != "")
+    return filled.sum(axis=1) >= min_af_nonempty
+
+def _write_columnar(path, df, output_format, args, hidden_cols=None):
+    """Write a sheet's data rows as typed Parquet or Arrow IPC; the header becomes the schema"""
+    pa = _require_pyarrow()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = _typed_frame(df, args.date_format, args.datetime_format, args.time_format)
+    af_cols = _gate_columns(args.af_columns, hidden_cols, args.af_gate_visible_only)
+    keep = _af_gate_mask(frame, af_cols, args.min_af_nonempty)
+    if args.visible_only:
+        frame = _drop_hidden_columns(frame, hidden_cols)
+    keep &= frame.notna().any(axis=1).to_numpy()
+    table = pa.Table.from_pandas(frame[keep], preserve_index=False)
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return table.num_rows, table.num_columns, get_file_hash(path), os.path.getsize(path)
+
+_SS_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DATE_CELL, _TIMEDELTA_CELL = 1, 2
+_MS_PER_DAY = 86400000
+
+def _from_excel_serials(serials, date1904=False):
+    """
+    Vectorized openpyxl.utils.datetime.from_excel: serials in [0, 1) become
+    times, everything else datetimes (millisecond precision, 1900 leap-year bug
+    honoured).
+    """
+    values = np.asarray(serials, dtype=np.float64)
+    days = np.floor(values)
+    ms = np.round((values - days) * _MS_PER_DAY).astype(np.int64)
+    time_only = (values >= 0) & (values < 1) & (ms < _MS_PER_DAY)
+    if date1904:
+        epoch = np.datetime64("1904-01-01", "ms")
+    else:
+        epoch = np.datetime64("1899-12-30", "ms")
+        days = np.where((values > 0) & (values < 60), days + 1, days)
+    stamps = epoch + days.astype("timedelta64[D]") + ms.astype("timedelta64[ms]")
+    out = stamps.astype(object)
+    for i in np.flatnonzero(time_only):
+        out[i] = out[i].time()
+    return out
+
+_COLUMN_INDEX_CACHE: dict[str, int] = {}
+
+def _column_index(ref):
+    """1-based column index of a cell reference such as 'AB12'"""
+    letters = ref.rstrip("0123456789")
+    idx = _COLUMN_INDEX_CACHE.get(letters)
+    if idx is None:
+        idx = _COLUMN_INDEX_CACHE[letters] = column_index_from_string(letters)
+    return idx
+
+def _sheet_parts(zf, workbook=None):
+    """Map sheet name -> worksheet XML part name inside the package"""
+    if workbook is None:
+        workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(_PKG_REL_NS + "Relationship")}
+    parts = {}
+    for sheet in workbook.iter(_SS_NS + "sheet"):
+        target = targets.get(sheet.get(_REL_NS + "id"), "")
+        parts[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    return parts
+
+_DIM_TAG_RE = re.compile(rb"<(?:\w+:)?(row|col)\b[^>]*>")
+_HIDDEN_ATTR_RE = re.compile(rb"\shidden=\"(?:1|true)\"")
+
+def _attr_int(tag, name):
+    m = re.search(rb"\s" + name + rb"=\"(\d+)\"", tag)
+    return int(m.group(1)) if m else None
+
+def _sheet_visibility(zf, part):
+    """
+    Hidden row numbers (1-based) and hidden column indexes (0-based) of a sheet,
+    as sorted int arrays. These are the hidden flags behind openpyxl's
+    row_dimensions/column_dimensions, which read-only worksheets do not load;
+    only the <row>/<col> start tags are matched, in one pass over the raw XML.
+    """
+    hidden_rows, hidden_cols = [], []
+    next_r = 1
+    tail = b""
+    with zf.open(part) as fh:
+        while True:
+            chunk = fh.read(1 << 20)
+            buf = tail + chunk
+            # Leave anything after the last complete tag for the next read
+            end = len(buf) if not chunk else buf.rfind(b">") + 1
+            for m in _DIM_TAG_RE.finditer(buf, 0, end):
+                tag = m.group(0)
+                if m.group(1) == b"row":
+                    r = _attr_int(tag, b"r") or next_r
+                    next_r = r + 1
+                    if _HIDDEN_ATTR_RE.search(tag):
+                        hidden_rows.append(r)
+                elif _HIDDEN_ATTR_RE.search(tag):
+                    lo = _attr_int(tag, b"min") or 1
+                    hidden_cols.extend(range(lo - 1, _attr_int(tag, b"max") or lo))
+            if not chunk:
+                break
+            tail = buf[end:]
+    return np.array(hidden_rows, dtype=np.int64), np.unique(np.array(hidden_cols, dtype=np.int64))
+
+class _XlsxSheet:
+    """Worksheet read straight from its XML part; mimics the read-only openpyxl API the exporter uses"""
+
+    def __init__(self, book, title, part):
+        self.book = book
+        self.title = title
+        self.part = part
+
+    def _iterparse(self):
+        with self.book.zf.open(self.part) as fh:
+            sheet_data = None
+            for event, el in ET.iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if el.tag == _SS_NS + "sheetData":
+                        sheet_data = el
+                    continue
+                yield el
+                if el.tag == _SS_NS + "row" and sheet_data is not None:
+                    # Rows are consumed as they close; drop them so memory stays flat
+                    sheet_data.clear()
+
+    def calculate_dimension(self, force=False):
+        if not force:
+            for el in self._iterparse():
+                if el.tag == _SS_NS + "dimension":
+                    return el.get("ref")
+                if el.tag in (_SS_NS + "row", _SS_NS + "sheetData"):
+                    break
+            raise ValueError("Worksheet is unsized, use calculate_dimension(force=True)")
+        max_r = max_c = 0
+        for el in self._iterparse():
+            if el.tag == _SS_NS + "row":
+                for c in el.iter(_SS_NS + "c"):
+                    ref = c.get("r")
+                    if ref:
+                        max_c = max(max_c, _column_index(ref))
+                max_r = int(el.get("r", max_r + 1))
+        if max_r == 0:
+            return "A1:A1"
+        return f"A1:{get_column_letter(max(max_c, 1))}{max_r}"
+
+    def _convert_pending(self, rows, pending):
+        """Convert date/time-styled serials collected for a block of rows in one vectorized pass"""
+        if not pending:
+            return
+        dates = [p for p in pending if p[2] == _DATE_CELL]
+        if dates:
+            converted = _from_excel_serials([p[3] for p in dates], self.book.date1904)
+            for (r, c, _, _), value in zip(dates, converted):
+                rows[r][c] = value
+        for r, c, kind, serial in pending:
+            if kind == _TIMEDELTA_CELL:
+                rows[r][c] = dtdelta(milliseconds=round(serial * _MS_PER_DAY))
+
+    def iter_rows(self, values_only=True, block_rows=_WRITE_BATCH_ROWS):
+        shared = self.book.shared_strings
+        styles = self.book.cell_kinds
+        rows, pending = [], []
+        next_r = 1
+        for el in self._iterparse():
+            if el.tag != _SS_NS + "row":
+                continue
+            r_idx = int(el.get("r", next_r))
+            # Missing rows come back empty, as with openpyxl, so row positions line up
+            rows.extend([] for _ in range(next_r, r_idx))
+            next_r = r_idx + 1
+            # Rows only grow to their last valued cell; style-only cells add no width
+            row = []
+            pos = 0
+            for c in el.iter(_SS_NS + "c"):
+                ref = c.get("r")
+                col = _column_index(ref) - 1 if ref else pos
+                pos = col + 1
+                t = c.get("t", "n")
+                if t == "inlineStr":
+                    value = "".join(node.text or "" for node in c.iter(_SS_NS + "t"))
+                else:
+                    v = c.find(_SS_NS + "v")
+                    if v is None or v.text is None:
+                        continue
+                    text = v.text
+                    if t == "s":
+                        value = shared[int(text)]
+                    elif t == "n":
+                        value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+                        kind = styles.get(int(c.get("s", 0)))
+                        if kind:
+                            pending.append((len(rows), col, kind, value))
+                    elif t == "b":
+                        value = text == "1"
+                    elif t == "d":
+                        value = datetime.fromisoformat(text)
+                    else:  # "str" formula results and "e" error codes
+                        value = text
+                if col >= len(row):
+                    row.extend([None] * (col + 1 - len(row)))
+                row[col] = value
+            rows.append(row)
+            if len(rows) >= block_rows:
+                self._convert_pending(rows, pending)
+                yield from map(tuple, rows)
+                rows, pending = [], []
+        self._convert_pending(rows, pending)
+        yield from map(tuple, rows)
+
+class _XlsxReader:
+    """
+    Minimal .xlsx reader built on zipfile + ElementTree.iterparse. Shared strings
+    are held as a plain list and cells come back as plain values, so no
+    per-cell objects are allocated.
+    """
+
+    def __init__(self, xlsx_path):
+        self.zf = zipfile.ZipFile(xlsx_path)
+        workbook = ET.fromstring(self.zf.read("xl/workbook.xml"))
+        pr = workbook.find(_SS_NS + "workbookPr")
+        self.date1904 = pr is not None and pr.get("date1904", "").lower() in ("1", "true")
+
+        self._parts = _sheet_parts(self.zf, workbook)
+        self.sheetnames = list(self._parts)
+        self.shared_strings = self._read_shared_strings()
+        self.cell_kinds = self._read_cell_kinds()
+
+    def _read_shared_strings(self):
+        if "xl/sharedStrings.xml" not in self.zf.namelist():
+            return []
+        strings = []
+        with self.zf.open("xl/sharedStrings.xml") as fh:
+            for _, el in ET.iterparse(fh):
+                if el.tag == _SS_NS + "si":
+                    # Plain <t> or rich-text runs <r><t>; phonetic <rPh> hints are skipped
+                    parts = [node.text or "" for node in el.findall(_SS_NS + "t")]
+                    parts += [node.text or "" for node in el.findall(f"{_SS_NS}r/{_SS_NS}t")]
+                    strings.append("".join(parts))
+                    el.clear()
+        return strings
+
+    def _read_cell_kinds(self):
+        """Map cellXfs style index -> date/timedelta kind for styles whose number format is temporal"""
+        if "xl/styles.xml" not in self.zf.namelist():
+            return {}
+        styles = ET.fromstring(self.zf.read("xl/styles.xml"))
+        formats = dict(BUILTIN_FORMATS)
+        for fmt in styles.iter(_SS_NS + "numFmt"):
+            formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode", "")
+        kinds = {}
+        cell_xfs = styles.find(_SS_NS + "cellXfs")
+        for idx, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+            code = formats.get(int(xf.get("numFmtId", 0)), "")
+            if is_timedelta_format(code):
+                kinds[idx] = _TIMEDELTA_CELL
+            elif is_date_format(code):
+                kinds[idx] = _DATE_CELL
+        return kinds
+
+    def __getitem__(self, sheet_name):
+        return _XlsxSheet(self, sheet_name, self._parts[sheet_name])
+
+    def close(self):
+        self.zf.close()
+
+class _WorkbookSource:
+    """
+    An opened workbook (openpyxl or pandas engine) that exports one sheet at a
+    time. The handle and its shared-strings table are parsed once and reused
+    for every sheet.
+    """
+
+    def __init__(self, xlsx_path, args):
+        self.xlsx_path = xlsx_path
+        self.args = args
+        self.file_size = os.path.getsize(xlsx_path)
+        self.engine = "openpyxl" if args.engine == "auto" else args.engine
+        self.output_format = getattr(args, "output_format", "csv")
+        if self.output_format in _COLUMNAR_FORMATS:
+            _require_pyarrow()
+        # Chunking is explicit via --chunksize or automatic for large workbooks; the
+        # openpyxl engine always streams block-wise
+        self.compression = _csv_compression(args)
+        self.chunked = bool(args.chunksize) or self.file_size >= _CHUNKED_MIN_BYTES
+        self.stream_rows = self.engine in ("openpyxl", "iterparse") or (self.chunked and self.output_format == "csv")
+
+        if self.engine == "iterparse":
+            self.wb = _XlsxReader(xlsx_path)
+            self.sheet_names = self.wb.sheetnames
+            self.excel_file = None
+        elif self.engine == "openpyxl":
+            self.wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+            self.sheet_names = self.wb.sheetnames
+            self.excel_file = None
+        else:
+            self.excel_file = pd.ExcelFile(xlsx_path, engine='openpyxl')
+            self.sheet_names = self.excel_file.sheet_names
+            self.wb = None
+
+        # Hidden rows/columns are only looked up when a flag needs them. Only
+        # visible cells count toward the gate, so with --af-gate-visible-only
+        # hidden rows can never pass a positive threshold and are skipped too.
+        self.needs_visibility = args.visible_only or args.af_gate_visible_only
+        self.skip_hidden_rows = args.visible_only or (args.af_gate_visible_only and args.min_af_nonempty > 0)
+        self._zf = self._parts = None
+
+    def _hidden_indexes(self, sheet_name):
+        """(hidden_rows, hidden_cols) index arrays for a sheet, or (None, None) when not needed"""
+        if not self.needs_visibility:
+            return None, None
+        if self.engine == "iterparse":
+            zf, part = self.wb.zf, self.wb._parts[sheet_name]
+        else:
+            if self._zf is None:
+                self._zf = zipfile.ZipFile(self.xlsx_path)
+                self._parts = _sheet_parts(self._zf)
+            zf, part = self._zf, self._parts[sheet_name]
+        hidden_rows, hidden_cols = _sheet_visibility(zf, part)
+        return (hidden_rows if self.skip_hidden_rows else None), hidden_cols
+
+    def export_sheet(self, sheet_name, out_path):
+        """
+        Export one sheet to out_path; returns the sheet's summary fields, or None if it is empty.
+        Output is written to a .part file and renamed into place only once complete, so
+        an interrupted export never leaves a truncated file under the final name.
+        """
+        tmp_path = out_path + _PART_SUFFIX
+        try:
+            record = self._export_sheet(sheet_name, tmp_path)
+        except BaseException:
+            _remove_partial_output(tmp_path)
+            raise
+        if record is not None:
+            os.replace(tmp_path, out_path)
+        return record
+
+    def _export_sheet(self, sheet_name, out_path):
+        args = self.args
+        engine = self.engine
+        df = rows = progress = None
+        extent = {"rows": 0, "cols": 0}
+        started = time.perf_counter()
+        hidden_rows, hidden_cols = self._hidden_indexes(sheet_name)
+        # Load sheet data based on engine. Worksheets are streamed through the
+        # trimming reader, so the used range is measured while exporting rather
+        # than trusted from the (possibly phantom) declared dimension.
+        if engine in ("openpyxl", "iterparse") or self.stream_rows:
+            # The pandas engine streams its reader's underlying read-only openpyxl sheet
+            ws = self.wb[sheet_name] if engine in ("openpyxl", "iterparse") else self.excel_file.book[sheet_name]
+            declared = _declared_range(ws)
+            progress = self._progress_bar(sheet_name, declared)
+            rows = _iter_used_rows(ws, extent, hidden_rows, progress)
+            first = next(rows, None)
+            if first is not None:
+                rows = itertools.chain([first], rows)
+            max_r, max_c = (extent["rows"], len(first)) if first is not None else (0, 0)
+        else:
+            declared = _declared_range(self.excel_file.book[sheet_name])
+            progress = self._progress_bar(sheet_name, declared)
+            df, extent = _parse_sheet_pandas(self.excel_file, sheet_name, hidden_rows)
+            setattr(df, "_include_headers", True)
+            max_r, max_c = _get_used_range(df)
+
+        if not args.include_empty and (max_r == 0 or max_c == 0):
+            if progress is not None:
+                progress.close()
+            return None
+
+        available_memory = psutil.virtual_memory().available / (1024 * 1024)  # MB
+        chunksize = args.chunksize or get_adaptive_chunksize(self.file_size, available_memory, max_c)
+        stats = {}
+
+        if self.output_format in _COLUMNAR_FORMATS:
+            frame = _sheet_frame_openpyxl(iter(rows or ())) if df is None else df
+            write_started = time.perf_counter()
+            row_count, col_count, file_sha256, bytes_written = _write_columnar(
+                out_path, frame, self.output_format, args, hidden_cols)
+            stats["write_seconds"] = time.perf_counter() - write_started
+            _sample_rss(stats)
+        elif self.stream_rows:
+            row_count, col_count, file_sha256, bytes_written = _stream_write_csv(
+                out_path,
+                _iter_rows_openpyxl(rows or (), args.visible_only, args.date_format, args.datetime_format, args.time_format,
+                                    args.af_columns, args.min_af_nonempty, args.af_gate_visible_only,
+                                    chunksize=chunksize, stats=stats, hidden_cols=hidden_cols),
+                args.encoding, args.bom, stats, self.compression)
+            if stats.get("widened"):
+                row_count, col_count, file_sha256, bytes_written = _pad_csv(
+                    out_path, col_count, args.encoding, args.bom, stats, self.compression)
+        else:
+            row_count, col_count, file_sha256, bytes_written = _stream_write_csv(
+                out_path,
+                _iter_rows_pandas(df, args.visible_only, args.date_format, args.datetime_format, args.time_format,
+                                  args.af_columns, args.min_af_nonempty, args.af_gate_visible_only, stats=stats,
+                                  hidden_cols=hidden_cols),
+                args.encoding, args.bom, stats, self.compression)
+
+        if progress is not None:
+            progress.update(max(progress.total or 0, extent["rows"]) - progress.n)
+            progress.close()
+        elapsed = time.perf_counter() - started
+        write_seconds = stats.get("write_seconds", 0.0)
+
+        return {
+            "format": self.output_format,
+            "compression": self.compression,
+            "file_sha256": file_sha256,
+            "bytes": bytes_written,
+            "rows": row_count,
+            "cols": col_count,
+            "used_range": _used_range_ref(extent["rows"], extent["cols"]),
+            "declared_range": declared,
+            "chunksize": chunksize if self.stream_rows and self.output_format == "csv" else None,
+            "peak_rss_mb": round(stats.get("peak_rss", 0) / (1024 * 1024), 1),
+            "parse_seconds": round(elapsed - write_seconds, 3),
+            "write_seconds": round(write_seconds, 3),
+            "rows_per_sec": round(row_count / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    def _progress_bar(self, sheet_name, declared):
+        """tqdm bar sized by the sheet's declared row count when --progress is on, else None"""
+        if not getattr(self.args, "progress", False):
+            return None
+        total = range_boundaries(declared)[3] if declared else None
+        return tqdm(total=total, desc=sheet_name, unit="rows", leave=False)
+
+    def close(self):
+        if self._zf is not None:
+            self._zf.close()
+        if self.wb:
+            self.wb.close()
+        if self.excel_file is not None:
+            self.excel_file.close()
+
+def _sheet_worker_main(conn, xlsx_path, args):
+    """Child process: open the workbook once, then export sheets on request until sent None"""
+    # Ctrl+C reaches the whole process group; the parent decides when to kill us
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    try:
+        source = _WorkbookSource(xlsx_path, args)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+    conn.send(("ready", source.sheet_names))
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+            sheet_name, out_path = job
+            try:
+                conn.send(("ok", source.export_sheet(sheet_name, out_path)))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        source.close()
+
+class _SheetWorker:
+    """
+    Runs a _WorkbookSource in a child process so a sheet that exceeds its timeout
+    can be killed outright, releasing its CPU and memory, instead of being left
+    running in a background thread.
+    """
+
+    def __init__(self, xlsx_path, args, timeout):
+        self.timeout = timeout
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._proc = multiprocessing.Process(target=_sheet_worker_main, args=(child_conn, xlsx_path, args), daemon=True)
+        self._proc.start()
+        child_conn.close()
+        status, payload = self._receive(self.timeout)
+        if status != "ready":
+            self.close()
+            raise ExportError(payload)
+        self.sheet_names = payload
+
+    def _receive(self, timeout):
+        try:
+            if not self._conn.poll(timeout):
+                raise ExportTimeoutError(f"Export timed out after {timeout} seconds")
+            return self._conn.recv()
+        except (EOFError, OSError):
+            raise ExportError(f"Export worker exited unexpectedly (exit code {self._proc.exitcode})")
+
+    def export_sheet(self, sheet_name, out_path):
+        self._conn.send((sheet_name, out_path))
+        status, payload = self._receive(self.timeout)
+        if status != "ok":
+            raise ExportError(payload)
+        return payload
+
+    def kill(self):
+        if self._proc.is_alive():
+            self._proc.kill()
+        self._proc.join()
+        self._conn.close()
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self._proc.join(5)
+        self.kill()
+
+def _remove_partial_output(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+JOURNAL_NAME = "export_journal.jsonl"
+_PART_SUFFIX = ".part"
+
+def _source_stat(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def _journal_append(journal_path, entry):
+    """Append one JSON line and fsync it, so a finished sheet is on disk before the next starts"""
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    # A single O_APPEND write keeps lines from concurrent workers whole
+    fd = os.open(journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def load_export_journal(out_dir, settings_hash):
+    """
+    Sheets completed by an earlier, interrupted run with the same settings:
+    {xlsx_path: {sheet_name: sheet result, or None if the sheet had nothing to export}}.
+    Entries whose workbook has changed since, or whose output is missing or a
+    different size, are dropped.
+    """
+    path = os.path.join(out_dir, JOURNAL_NAME)
+    completed = {}
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn final line from a hard kill
+            if entry.get("settings") != settings_hash:
+                continue
+            source = entry.get("source")
+            try:
+                if _source_stat(source) != entry.get("stat"):
+                    continue
+            except (OSError, TypeError):
+                continue
+            result = entry.get("result")
+            if result is not None:
+                try:
+                    if os.path.getsize(result["file"]) != result.get("bytes"):
+                        continue
+                except (OSError, KeyError):
+                    continue
+            completed.setdefault(source, {})[entry.get("sheet")] = result
+    return completed
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt(f"received signal {signum}")
+
+def _install_interrupt_handlers():
+    """
+    Make SIGTERM unwind like Ctrl+C so workers are killed and .part files removed;
+    the journal needs no flushing since every entry is fsynced as it is written.
+    Returns the previous handlers, or None outside the main thread.
+    """
+    try:
+        return {sig: signal.signal(sig, _raise_interrupt) for sig in (signal.SIGINT, signal.SIGTERM)}
+    except ValueError:
+        return None
+
+def _restore_handlers(previous):
+    for sig, handler in (previous or {}).items():
+        signal.signal(sig, handler)
+
+def _exit_pool_worker(signum, frame):
+    for proc in multiprocessing.active_children():
+        proc.kill()
+    os._exit(128 + signum)
+
+def _init_pool_worker():
+    """
+    Pool workers leave Ctrl+C to the parent, and on SIGTERM kill their sheet worker
+    and exit at once; raising instead would let the pool hand them the next workbook.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_pool_worker)
+
+def process_excel_file(xlsx_path, out_dir, args, logger, name_plan=None, resume_records=None, journal_path=None):
+    """
+    Process a single Excel file and return results.
+
+    With a positive args.sheet_timeout (default 300s) sheets are exported in a
+    child process that is killed, and its partial output removed, when a sheet
+    runs over; remaining sheets continue in a fresh worker. A timeout of 0 runs
+    everything in-process with no limit.
+
+    Sheets listed in resume_records (from load_export_journal) are not exported
+    again; their recorded results are reused. With journal_path set, each sheet
+    is appended to the journal as soon as its output is in place.
+    """
     results = {
         "file": xlsx_path,
         "success": False,
         "sheets": [],
         "error": None
     }
+    timeout = getattr(args, "sheet_timeout", 300) or 0
+    resume_records = resume_records or {}
+    source = None
     
     try:
         file_size = os.path.getsize(xlsx_path)
-        available_memory = psutil.virtual_memory().available / (1024 * 1024)  # MB
-        
         engine = "openpyxl" if args.engine == "auto" else args.engine
-        chunksize = args.chunksize if args.chunksize else get_adaptive_chunksize(file_size, available_memory)
         
         logger.info(f"Processing: {os.path.basename(xlsx_path)}")
         logger.info(f"Using engine: {engine}, file size: {file_size / (1024*1024):.2f}MB")
         
-        # Initialize workbook based on engine
-        if engine == "openpyxl":
-            wb = load_workbook(xlsx_path, read_only=True, data_only=True)
-            sheet_names = wb.sheetnames
-        else:
-            excel_file = pd.ExcelFile(xlsx_path, engine='openpyxl')
-            sheet_names = excel_file.sheet_names
-            wb = None
-        
-        used_names = set()
+        source = _SheetWorker(xlsx_path, args, timeout) if timeout > 0 else _WorkbookSource(xlsx_path, args)
         
         # Filter sheets based on include/exclude
-        filtered_sheets = []
-        for sheet_name in sheet_names:
-            if not args.all_sheets:
-                if args.exclude and any(pat.lower() in sheet_name.lower() for pat in args.exclude):
-                    continue
-                if args.include and not any(pat.lower() in sheet_name.lower() for pat in args.include):
-                    continue
-            filtered_sheets.append(sheet_name)
+        filtered_sheets = _filter_sheets(source.sheet_names, args)
+        if name_plan is None or any(name not in name_plan for name in filtered_sheets):
+            name_plan = plan_output_names(xlsx_path, filtered_sheets, set())
+        output_format = getattr(args, "output_format", "csv")
+        compression = _csv_compression(args)
+        if getattr(args, "compress", None) == "zstd" and compression == "gzip":
+            logger.warning("zstandard is not installed; writing gzip (.csv.gz) instead of zstd")
+        journal_entry = None
+        if journal_path:
+            journal_entry = {"source": xlsx_path, "stat": _source_stat(xlsx_path), "settings": _export_settings_hash(args)}
         
         # Process each sheet
         for sheet_name in filtered_sheets:
+            safe, out_name = name_plan[sheet_name]
+            if output_format in _COLUMNAR_FORMATS:
+                out_name = os.path.splitext(out_name)[0] + _COLUMNAR_FORMATS[output_format]
+            elif compression:
+                out_name += _CSV_COMPRESSIONS[compression]
+            out_path = os.path.join(out_dir, out_name)
+            if sheet_name in resume_records:
+                done = resume_records[sheet_name]
+                if done is not None:
+                    results["sheets"].append(dict(done, resumed=True))
+                logger.info(f"  Already exported in an earlier run, skipping: {sheet_name}")
+                continue
             try:
-                # Load sheet data based on engine
-                if engine == "openpyxl":
-                    ws = wb[sheet_name]
-                    max_r, max_c = _get_used_range(ws)
-                    is_df = False
-                else:
-                    df = pd.read_excel(xlsx_path, sheet_name=sheet_name, engine='openpyxl', keep_default_na=False)
-                    setattr(df, "_include_headers", True)
-                    max_r, max_c = _get_used_range(df)
-                    is_df = True
-                    ws = None
-                
-                if not args.include_empty and (max_r == 0 or max_c == 0):
-                    logger.info(f"  Skipping empty sheet: {sheet_name}")
-                    continue
-                
-                safe = sanitize_filename(sheet_name, used_names)
-                # If only one sheet is being exported, use the workbook base name
-                if len(filtered_sheets) == 1:
-                    csv_name = os.path.splitext(os.path.basename(xlsx_path))[0] + ".csv"
-                else:
-                    csv_name = f"{safe}.csv"
-                csv_path = os.path.join(out_dir, csv_name)
-                
-                @timeout_handler(300)  # 5 min timeout
-                def export_with_timeout():
-                    if engine == "openpyxl":
-                        # For openpyxl, we'd need to implement _iter_rows function or use calamine
-                        return _stream_write_csv(csv_path, _iter_rows_pandas(pd.read_excel(xlsx_path, sheet_name=sheet_name, engine='openpyxl', keep_default_na=False), 
-                                                                              args.visible_only, args.date_format, args.datetime_format, args.time_format, 
-                                                                              args.af_columns, args.min_af_nonempty, args.af_gate_visible_only), 
-                                                 args.encoding, args.bom)
+                if source is None:
+                    source = _SheetWorker(xlsx_path, args, timeout)
+                record = source.export_sheet(sheet_name, out_path)
+                if record is None or record["rows"] == 0:
+                    if record is None:
+                        logger.info(f"  Skipping empty sheet: {sheet_name}")
                     else:
-                        return _stream_write_csv(csv_path, _iter_rows_pandas(df, args.visible_only, args.date_format, args.datetime_format, args.time_format, 
-                                                                              args.af_columns, args.min_af_nonempty, args.af_gate_visible_only), 
-                                                 args.encoding, args.bom)
-                
-                row_count, col_count = export_with_timeout()
-                if row_count == 0:
-                    logger.info(f"  No rows exported from sheet: {sheet_name}")
+                        logger.info(f"  No rows exported from sheet: {sheet_name}")
+                    if journal_entry:
+                        _journal_append(journal_path, dict(journal_entry, sheet=sheet_name, result=None))
                     continue
                 
-                results["sheets"].append({
+                sheet_result = {
                     "sheet_name": sheet_name,
                     "sanitized_name": safe,
-                    "file": csv_path,
-                    "file_sha256": get_file_hash(csv_path),
-                    "rows": row_count,
-                    "cols": col_count
-                })
-                logger.info(f"  OK: Exported {row_count} rows x {col_count} cols to {os.path.basename(csv_path)}")
+                    "file": out_path,
+                    **record,
+                }
+                results["sheets"].append(sheet_result)
+                if journal_entry:
+                    _journal_append(journal_path, dict(journal_entry, sheet=sheet_name, result=sheet_result))
+                logger.info(f"  OK: Exported {record['rows']} rows x {record['cols']} cols to {os.path.basename(out_path)}")
+                declared, used = record.get("declared_range"), record.get("used_range")
+                if declared and used and declared != used:
+                    logger.info(f"  Trimmed declared range {declared} to used range {used}")
                 
+            except KeyboardInterrupt:
+                if isinstance(source, _SheetWorker):
+                    source.kill()
+                    source = None
+                _remove_partial_output(out_path + _PART_SUFFIX)
+                raise
             except Exception as e:
+                if isinstance(e, ExportTimeoutError) or (isinstance(source, _SheetWorker) and not source._proc.is_alive()):
+                    # Kill the stuck (or dead) worker and drop whatever it had written; source
+                    # is None when starting the replacement worker is what failed
+                    if source is not None:
+                        source.kill()
+                        source = None
+                    _remove_partial_output(out_path + _PART_SUFFIX)
                 logger.error(f"  ERROR: Error processing sheet {sheet_name}: {str(e)}")
                 results["sheets"].append({
                     "sheet_name": sheet_name,
@@ -343,18 +1348,202 @@ def process_excel_file(xlsx_path, out_dir, args, logger):
                     "error": str(e)
                 })
         
-        if wb:
-            wb.close()
-        
         results["success"] = len(results["sheets"]) > 0
         
     except Exception as e:
         logger.error(f"ERROR processing file: {str(e)}")
         results["error"] = str(e)
+    finally:
+        if source is not None:
+            source.close()
     
     return results
 
-def main(src=None, out=None):
+MANIFEST_NAME = "export_manifest.json"
+
+# Args that change what ends up in the exported files; anything else (workers,
+# logging, caching) can vary between runs without invalidating the manifest.
+_CACHE_ARG_KEYS = (
+    "engine", "include", "exclude", "all_sheets", "include_empty", "visible_only",
+    "date_format", "datetime_format", "time_format", "af_columns", "min_af_nonempty",
+    "af_gate_visible_only", "encoding", "bom", "output_format", "compress",
+    # pandas-engine output differs with chunking (raw header row vs. "Unnamed: N" headers)
+    "chunksize",
+)
+
+def _export_settings_hash(args):
+    settings = {key: getattr(args, key, None) for key in _CACHE_ARG_KEYS}
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _cache_key(source_sha256, settings_hash, plan):
+    payload = json.dumps({"source": source_sha256, "settings": settings_hash, "plan": plan}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def load_export_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("entries", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_export_manifest(out_dir, entries):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "entries": entries}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def _output_intact(sheet):
+    """Whether a sheet's output still has the byte count and SHA-256 recorded when it was written."""
+    try:
+        if os.path.getsize(sheet["file"]) != sheet.get("bytes"):
+            return False
+    except OSError:
+        return False
+    return sheet.get("file_sha256") is not None and get_file_hash(sheet["file"]) == sheet["file_sha256"]
+
+def _outputs_intact(result):
+    return all(_output_intact(sheet) for sheet in result.get("sheets", []) if "file" in sheet)
+
+def _is_cacheable(result):
+    return result.get("success") and not any(sheet.get("status") == "error" for sheet in result.get("sheets", []))
+
+def _run_exports(jobs, out_dir, args, logger, journal_path=None):
+    """
+    Run (xlsx_path, name_plan, resume_records) jobs serially or across a process
+    pool; results keep job order.
+    """
+    total = len(jobs)
+    workers = min(max(1, getattr(args, "workers", 1) or 1), total) if total else 1
+
+    if workers == 1:
+        results = []
+        for i, (xlsx_path, plan, done) in enumerate(jobs, 1):
+            logger.info("Exporting [%s/%s] %s", i, total, os.path.basename(xlsx_path))
+            results.append(process_excel_file(xlsx_path, out_dir, args, logger, plan, done, journal_path))
+        return results
+
+    logger.info("Exporting %s workbooks with %s worker processes", total, workers)
+    results = [None] * total
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker)
+    try:
+        futures = {
+            pool.submit(process_excel_file, xlsx_path, out_dir, args, logger, plan, done, journal_path): idx
+            for idx, (xlsx_path, plan, done) in enumerate(jobs)
+        }
+        for finished, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            xlsx_path = jobs[idx][0]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                logger.error(f"ERROR processing file {os.path.basename(xlsx_path)} in worker: {str(e)}")
+                results[idx] = {"file": xlsx_path, "success": False, "sheets": [], "error": str(e)}
+            logger.info("Finished [%s/%s] %s", finished, total, os.path.basename(xlsx_path))
+    except KeyboardInterrupt:
+        # Don't wait for running workbooks: stop the pool workers (and with them
+        # their sheet workers); stray .part files are cleared on the next run
+        pool.shutdown(wait=False, cancel_futures=True)
+        for proc in multiprocessing.active_children():
+            proc.terminate()
+        raise
+    pool.shutdown()
+    return results
+
+def export_workbooks(xlsx_files, out_dir, args, logger):
+    """
+    Export workbooks serially or, with args.workers > 1, across a process pool.
+    Output names are planned up front in input order and results come back in
+    input order, so the summary and sheet-name collisions match a serial run.
+
+    Unless args.use_cache is False, workbooks whose SHA-256, export settings and
+    output plan match an entry in the output directory's manifest, and whose
+    outputs still match their recorded size and SHA-256, are skipped and their
+    recorded results reused. The manifest keeps entries for workbooks not in
+    this run.
+
+    Every finished sheet is also appended to the output directory's journal. An
+    interrupted run (including SIGINT/SIGTERM) keeps the journal, and a rerun
+    with args.resume skips the sheets it records; a run that completes removes it.
+    """
+    used_names = set()
+    plans = [
+        plan_output_names(path, _filter_sheets(_list_sheet_names(path), args), used_names)
+        for path in xlsx_files
+    ]
+    use_cache = getattr(args, "use_cache", True)
+    manifest = load_export_manifest(out_dir) if use_cache else {}
+    settings_hash = _export_settings_hash(args)
+
+    os.makedirs(out_dir, exist_ok=True)
+    journal_path = os.path.join(out_dir, JOURNAL_NAME)
+    if getattr(args, "resume", False):
+        journal = load_export_journal(out_dir, settings_hash)
+    else:
+        journal = {}
+        _remove_partial_output(journal_path)
+    # .part files are never complete outputs; clear any left by a killed run
+    for name in os.listdir(out_dir):
+        if name.endswith(_PART_SUFFIX):
+            _remove_partial_output(os.path.join(out_dir, name))
+
+    results = [None] * len(xlsx_files)
+    keys = [None] * len(xlsx_files)
+    pending = []
+    for idx, (xlsx_path, plan) in enumerate(zip(xlsx_files, plans)):
+        if use_cache:
+            keys[idx] = _cache_key(get_file_hash(xlsx_path), settings_hash, plan)
+            entry = manifest.get(keys[idx])
+            if entry and _outputs_intact(entry["result"]):
+                logger.info("Unchanged since last export, reusing outputs: %s", os.path.basename(xlsx_path))
+                results[idx] = dict(entry["result"], file=xlsx_path, cached=True)
+                continue
+        done = journal.get(xlsx_path, {})
+        if plan and all(sheet in done for sheet in plan):
+            logger.info("Completed before interruption, reusing outputs: %s", os.path.basename(xlsx_path))
+            sheets = [dict(done[sheet], resumed=True) for sheet in plan if done[sheet] is not None]
+            results[idx] = {"file": xlsx_path, "success": bool(sheets), "sheets": sheets, "error": None}
+            continue
+        pending.append(idx)
+
+    if pending:
+        previous_handlers = _install_interrupt_handlers()
+        try:
+            exported = _run_exports(
+                [(xlsx_files[idx], plans[idx], journal.get(xlsx_files[idx])) for idx in pending],
+                out_dir, args, logger, journal_path,
+            )
+        except KeyboardInterrupt:
+            logger.warning("Export interrupted; finished sheets are recorded in %s, rerun with --resume to continue",
+                           journal_path)
+            raise
+        finally:
+            _restore_handlers(previous_handlers)
+        for idx, result in zip(pending, exported):
+            results[idx] = result
+
+    if use_cache:
+        # Keep other workbooks' entries (e.g. after an --xlsx run); this run's
+        # workbooks replace theirs, so stale keys don't pile up
+        exported_sources = set(xlsx_files)
+        entries = {key: entry for key, entry in manifest.items() if entry.get("source") not in exported_sources}
+        for idx, result in enumerate(results):
+            if _is_cacheable(result):
+                cached_result = {k: v for k, v in result.items() if k != "cached"}
+                cached_result["sheets"] = [
+                    {k: v for k, v in sheet.items() if k != "resumed"} for sheet in result.get("sheets", [])
+                ]
+                entries[keys[idx]] = {"source": xlsx_files[idx], "result": cached_result}
+        save_export_manifest(out_dir, entries)
+    _remove_partial_output(journal_path)
+    return results
+
+def main(src=None, out=None, workers=1, use_cache=True, output_format="csv", sheet_timeout=300, progress=False,
+         resume=False, compress=None):
     if src is not None or out is not None:
         source_dir = Path(src or "raw_data/xlsx")
         output_dir = Path(out or "output")
@@ -384,6 +1573,13 @@ def main(src=None, out=None):
             encoding="utf-8",
             bom=True,
             disable_af_gate=True,
+            workers=workers,
+            use_cache=use_cache,
+            output_format=output_format,
+            sheet_timeout=sheet_timeout,
+            progress=progress,
+            resume=resume,
+            compress=compress,
         )
 
         files = []
@@ -401,14 +1597,13 @@ def main(src=None, out=None):
             "failed_conversions": 0,
         }
 
-        for idx, file_path in enumerate(files, 1):
-            logger.info("Exporting [%s/%s] %s", idx, len(files), file_path.name)
-            result = process_excel_file(str(file_path), str(output_dir), args, logger)
+        for result in export_workbooks([str(f) for f in files], str(output_dir), args, logger):
             summary["files_processed"].append(result)
             if result["success"]:
                 summary["successful_conversions"] += 1
             else:
                 summary["failed_conversions"] += 1
+        summary["cached_files"] = sum(1 for r in summary["files_processed"] if r.get("cached"))
 
         summary["end_time"] = datetime.now().isoformat()
         summary["duration_seconds"] = (
@@ -445,10 +1640,27 @@ def main(src=None, out=None):
                     help="If set, only visible cells among --af-columns count toward the threshold.")
     ap.add_argument("--disable-af-gate", action="store_true", default=True,
                     help="Disable A-F gate filtering (export all rows) - enabled by default")
-    ap.add_argument("--engine", default="auto", choices=["auto", "openpyxl"],
-                    help="Engine for reading Excel files (default: openpyxl)")
+    ap.add_argument("--engine", default="auto", choices=["auto", "openpyxl", "pandas", "iterparse"],
+                    help="Engine for reading Excel files (default: openpyxl). 'pandas' parses each workbook once and emits DataFrame headers; "
+                         "'iterparse' reads sheet XML directly without openpyxl cell objects")
     ap.add_argument("--chunksize", type=int, default=None,
-                    help="Read file in chunks of this size for large files (auto-enabled for 50MB+ files)")
+                    help="Rows per block when streaming sheets (default: sized from available memory; "
+                         "the pandas engine switches to block streaming for 50MB+ files)")
+    ap.add_argument("--format", dest="output_format", default="csv", choices=["csv", "parquet", "arrow"],
+                    help="Output format; parquet/arrow write typed columns (requires pyarrow) (default: csv)")
+    ap.add_argument("--compress", default="none", choices=["none", "gzip", "zstd"],
+                    help="Compress CSV output while streaming (.csv.gz / .csv.zst); zstd needs the zstandard "
+                         "package and falls back to gzip without it (default: none)")
+    ap.add_argument("--sheet-timeout", type=float, default=300,
+                    help="Seconds before a sheet export is killed and its partial output removed; 0 disables (default: 300)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Number of worker processes used to export workbooks in parallel (default: 1)")
+    ap.add_argument("--force", dest="use_cache", action="store_false",
+                    help=f"Re-export every workbook, ignoring {MANIFEST_NAME} in the output directory")
+    ap.add_argument("--resume", action="store_true",
+                    help=f"Skip sheets that {JOURNAL_NAME} records as finished by an interrupted run")
+    ap.add_argument("--progress", action="store_true",
+                    help="Show a per-sheet progress bar sized by the sheet's declared row count")
     ap.add_argument("--log-file", default="export_log.json", help="Log file path (default: export_log.json)")
 
     args = ap.parse_args()
@@ -480,6 +1692,7 @@ def main(src=None, out=None):
         xlsx_files = []
         for ext in ['*.xlsx', '*.xls']:
             xlsx_files.extend([os.path.abspath(f) for f in os.listdir(current_dir) if fnmatch.fnmatch(f.lower(), ext.lower())])
+        xlsx_files.sort()
 
         if not xlsx_files:
             logger.error("No Excel files found in current directory")
@@ -503,17 +1716,20 @@ def main(src=None, out=None):
         "failed_conversions": 0
     }
 
-    for i, xlsx_path in enumerate(xlsx_files, 1):
-        logger.info("")
-        print(f"\n[{i}/{len(xlsx_files)}] Processing {os.path.basename(xlsx_path)}...")
+    try:
+        exported = export_workbooks(xlsx_files, output_dir, args, logger)
+    except KeyboardInterrupt:
+        print("\nExport interrupted; rerun with --resume to continue from the last finished sheet")
+        sys.exit(130)
 
-        result = process_excel_file(xlsx_path, output_dir, args, logger)
+    for result in exported:
         all_results["files_processed"].append(result)
 
         if result["success"]:
             all_results["successful_conversions"] += 1
         else:
             all_results["failed_conversions"] += 1
+    all_results["cached_files"] = sum(1 for r in all_results["files_processed"] if r.get("cached"))
 
     all_results["end_time"] = datetime.now().isoformat()
     all_results["duration_seconds"] = (datetime.fromisoformat(all_results["end_time"]) -
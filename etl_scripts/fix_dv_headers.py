@@ -7,7 +7,7 @@ import logging
 import re
 from pathlib import Path
 
-import pandas as pd
+from etl_scripts import mapping_registry, tabular_io
 
 YES_NO_MAP_FILE = Path("docs/mappings/yes_no_bool_map.csv")
 
@@ -16,15 +16,11 @@ logger = logging.getLogger(__name__)
 
 
 def load_boolean_vocab(path: Path = YES_NO_MAP_FILE):
-    if not path.exists():
+    vocab = mapping_registry.yes_no_vocab(path)
+    if vocab is None:
         logger.warning("Boolean mapping file %s not found. Falling back to defaults.", path)
-        truthy = {"X", "O", "Y", "YES", "T", "TRUE", "1"}
-        falsy = {"N", "NO", "F", "FALSE", "0", ""}
-    else:
-        df = pd.read_csv(path)
-        truthy = {str(v).strip().upper() for v in df[df["boolean"].astype(str).str.lower() == "true"]["raw"]}
-        falsy = {str(v).strip().upper() for v in df[df["boolean"].astype(str).str.lower() == "false"]["raw"]}
-    return truthy, falsy
+        return frozenset({"X", "O", "Y", "YES", "T", "TRUE", "1"}), frozenset({"N", "NO", "F", "FALSE", "0", ""})
+    return vocab.truthy, vocab.falsy
 
 def to_pascal_case(name):
     """Convert a string to PascalCase"""
@@ -116,34 +112,13 @@ def convert_boolean_values(df):
             continue
     
     # Second pass: convert identified columns
+    vocab = mapping_registry.BooleanVocab(truthy_values, falsy_values)
     for col in cols_to_convert:
         logger.info(f"Converting column '{col}' to boolean")
-        def _map_value(val):
-            if pd.isna(val):
-                return False
-            normalized = str(val).strip().upper()
-            if normalized in truthy_values:
-                return True
-            if normalized in falsy_values:
-                return False
-            return val
-
-        df[col] = df[col].apply(_map_value)
+        df[col] = vocab.map_series(df[col])
     
     return df
 
-def _read_tabular(path: Path, **kwargs) -> pd.DataFrame:
-    suffix = path.suffix.lower()
-    if suffix == ".csv":
-        try:
-            return pd.read_csv(path, engine="pyarrow", **kwargs)
-        except (ImportError, ValueError):
-            return pd.read_csv(path, low_memory=False, **kwargs)
-    if suffix in {".xlsx", ".xlsm", ".xls"}:
-        return pd.read_excel(path, engine='openpyxl', **kwargs)
-    raise ValueError(f"Unsupported file type: {path}")
-
-
 def examine_files():
     """Examine the files to understand their structure"""
     dv_candidates = [
@@ -156,8 +131,8 @@ def examine_files():
         Path('raw_data/xlsx/_2023_2025_10_31_dv_rms.xlsx'),
     ]
 
-    dv_file = next((path for path in dv_candidates if path.exists()), None)
-    rms_file = next((path for path in rms_candidates if path.exists()), None)
+    dv_file = next((path for path in map(tabular_io.find_csv, dv_candidates) if path.exists()), None)
+    rms_file = next((path for path in map(tabular_io.find_csv, rms_candidates) if path.exists()), None)
 
     if dv_file is None:
         raise FileNotFoundError("No DV source file found. Expected CSV export or fallback Excel workbook.")
@@ -165,7 +140,7 @@ def examine_files():
         raise FileNotFoundError("No RMS source file found. Expected CSV export or fallback Excel workbook.")
     
     logger.info(f"Examining {dv_file}")
-    df_dv = _read_tabular(dv_file, nrows=5)
+    df_dv = tabular_io.read_tabular(dv_file, nrows=5)
     
     logger.info(f"DV file columns ({len(df_dv.columns)}):")
     problematic_cols = []
@@ -182,7 +157,7 @@ def examine_files():
             print(f"  {col:50s} - {', '.join(issues)}")
     
     logger.info(f"\nExamining {rms_file}")
-    df_rms = _read_tabular(rms_file, nrows=5)
+    df_rms = tabular_io.read_tabular(rms_file, nrows=5)
     
     logger.info(f"RMS file columns ({len(df_rms.columns)}):")
     case_cols = [c for c in df_rms.columns if 'case' in c.lower() or 'number' in c.lower()]
@@ -201,7 +176,7 @@ def process_dv_file(input_file, output_file=None):
     
     # Read the file
     input_path = Path(input_file)
-    df = _read_tabular(input_path)
+    df = tabular_io.read_tabular(input_path)
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
     
     # Fix column headers
@@ -212,7 +187,7 @@ def process_dv_file(input_file, output_file=None):
     
     # Save output
     if output_file is None:
-        output_file = Path('processed_data') / f"{input_path.stem}_fixed.csv"
+        output_file = Path('processed_data') / f"{tabular_io.tabular_stem(input_path)}_fixed.csv"
     
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -248,7 +223,7 @@ if __name__ == "__main__":
         Path('raw_data/csv/_2023_2025_10_31_dv.csv'),
         Path('raw_data/xlsx/_2023_2025_10_31_dv.xlsx'),
     ]
-    input_file = next((path for path in input_candidates if path.exists()), None)
+    input_file = next((path for path in map(tabular_io.find_csv, input_candidates) if path.exists()), None)
     if input_file is None:
         raise FileNotFoundError("Unable to locate DV input file for processing.")
     df_fixed, mapping = process_dv_file(input_file)
@@ -258,5 +233,5 @@ if __name__ == "__main__":
     for old, new in sorted(mapping.items()):
         print(f"  {old:50s} -> {new}")
     
-    print(f"\nOutput saved to: processed_data/{input_file.stem}_fixed.csv")
+    print(f"\nOutput saved to: processed_data/{tabular_io.tabular_stem(input_file)}_fixed.csv")
 
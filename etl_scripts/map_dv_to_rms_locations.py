@@ -5,65 +5,85 @@ Prepares data for ArcGIS Pro mapping using arcpy
 
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from etl_scripts import case_index, mapping_registry, tabular_io
+
 LOCATION_MAP_FILE = Path("docs/mappings/location_join_keys.csv")
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+def _build_location_configs(frame: pd.DataFrame):
+    configs: Dict[str, Dict[str, Any]] = {}
+    for _, row in frame.iterrows():
+        location_cols = [col.strip() for col in row["location_columns"].split(";") if col.strip()]
+        configs.setdefault(row["dataset"], {
+            "dv_case_col": row["dv_case_col"],
+            "rms_case_col": row["rms_case_col"],
+            "location_columns": location_cols or ["FullAddress"],
+        })
+    return configs
+
+
 def load_location_config(dataset: str = "domestic_violence"):
-    if not LOCATION_MAP_FILE.exists():
+    configs = mapping_registry.lookup(LOCATION_MAP_FILE, "location_configs", _build_location_configs)
+    if configs is None:
         logger.warning("Location mapping file %s not found. Using defaults.", LOCATION_MAP_FILE)
         return {
             "dv_case_col": "CaseNumber",
             "rms_case_col": "Case Number",
             "location_columns": ["FullAddress"],
         }
-    df = pd.read_csv(LOCATION_MAP_FILE)
-    row = df[df["dataset"] == dataset]
-    if row.empty:
+    if dataset not in configs:
         logger.warning("Dataset %s not found in %s. Using defaults.", dataset, LOCATION_MAP_FILE)
         return {
             "dv_case_col": "CaseNumber",
             "rms_case_col": "Case Number",
             "location_columns": ["FullAddress"],
         }
-    location_cols = str(row.iloc[0]["location_columns"]).split(";")
-    location_cols = [col.strip() for col in location_cols if col.strip()]
-    return {
-        "dv_case_col": row.iloc[0]["dv_case_col"],
-        "rms_case_col": row.iloc[0]["rms_case_col"],
-        "location_columns": location_cols or ["FullAddress"],
-    }
+    config = configs[dataset]
+    return {**config, "location_columns": list(config["location_columns"])}
+
+
+def _rms_reference(rms_file: Path, rms_case_col: str, location_columns: Optional[List[str]]):
+    """
+    One row per case from the persisted RMS case index, with the case number in
+    ``rms_case_col``. Location columns the index does not carry are read from
+    ``rms_file`` and collapsed the same way (first non-null value per case).
+    """
+    index = case_index.load_case_index(rms_file, "rms")
+    if index is None:
+        raise ValueError(f"Cannot index RMS file {rms_file}: no '{case_index.KEY_SOURCES['rms']}' column")
+    df_rms = index.rename_axis(rms_case_col).reset_index()
+    extra = [col for col in location_columns or () if col not in df_rms.columns]
+    if extra:
+        logger.info("Location columns not in the RMS case index, read from %s: %s", rms_file, ", ".join(extra))
+        raw = tabular_io.read_tabular(
+            rms_file, columns=[case_index.KEY_SOURCES["rms"], *extra], engine="c", dtype=str
+        )
+        if case_index.KEY_SOURCES["rms"] in raw.columns:
+            df_rms = df_rms.join(case_index.first_per_case(raw, case_index.KEY_SOURCES["rms"]), on=rms_case_col)
+    return df_rms
+
 
-def _read_tabular(path: Path) -> pd.DataFrame:
-    """Read CSV (preferred) or Excel data into a DataFrame."""
-    suffix = path.suffix.lower()
-    if suffix == ".csv":
-        try:
-            return pd.read_csv(path, engine="pyarrow")
-        except (ImportError, ValueError):
-            logger.debug("pyarrow engine unavailable; falling back to default pandas CSV reader for %s", path)
-            return pd.read_csv(path, low_memory=False)
-    if suffix in {".xlsx", ".xlsm", ".xls"}:
-        logger.warning("Reading Excel input %s; convert to CSV for faster processing if possible.", path)
-        return pd.read_excel(path, engine="openpyxl")
-    raise ValueError(f"Unsupported file type: {path.suffix} for {path}")
-
-
-def load_files(dv_file: Path, rms_file: Path):
-    """Load both DV and RMS files"""
+def load_files(
+    dv_file: Path,
+    rms_file: Path,
+    rms_case_col: str = 'Case Number',
+    location_columns: Optional[List[str]] = None,
+):
+    """Load the DV file and the RMS location columns (from the RMS case index)"""
     logger.info(f"Loading DV file: {dv_file}")
-    df_dv = _read_tabular(dv_file)
+    df_dv = tabular_io.read_tabular(dv_file)
     logger.info(f"DV file: {len(df_dv)} rows, {len(df_dv.columns)} columns")
     
-    logger.info(f"Loading RMS file: {rms_file}")
-    df_rms = _read_tabular(rms_file)
-    logger.info(f"RMS file: {len(df_rms)} rows, {len(df_rms.columns)} columns")
+    logger.info(f"Loading RMS case index for: {rms_file}")
+    df_rms = _rms_reference(rms_file, rms_case_col, location_columns)
+    logger.info(f"RMS index: {len(df_rms)} cases, {len(df_rms.columns)} columns")
     
     return df_dv, df_rms
 
@@ -95,16 +115,21 @@ def map_case_numbers(df_dv: pd.DataFrame, df_rms: pd.DataFrame,
     logger.info(f"DV Case Number sample: {df_dv[dv_case_col].head().tolist()}")
     logger.info(f"RMS Case Number sample: {df_rms[rms_case_col].head().tolist()}")
     
-    # Merge on case numbers
+    # Merge on case numbers, normalised on both sides the way the case index keys them;
+    # RMS rows collapse to one per case (first non-null value per column, as in the
+    # case index) so repeated exports don't fan out DV rows
     logger.info("Merging DV and RMS data...")
+    dv_keys = case_index.normalize_case_numbers(df_dv[dv_case_col])
+    rms_rows = case_index.first_per_case(df_rms, rms_case_col)
+    rms_rows.insert(0, rms_case_col, rms_rows.index)
     merged_df = pd.merge(
-        df_dv,
-        df_rms,
-        left_on=dv_case_col,
-        right_on=rms_case_col,
+        df_dv.assign(**{case_index.KEY_COLUMN: dv_keys}),
+        rms_rows,
+        left_on=case_index.KEY_COLUMN,
+        right_index=True,
         how='left',
         suffixes=('_DV', '_RMS')
-    )
+    ).drop(columns=case_index.KEY_COLUMN).reset_index(drop=True)
     
     logger.info(f"Merged file: {len(merged_df)} rows (from {len(df_dv)} DV rows)")
     
@@ -257,9 +282,9 @@ def main(src=None, out=None):
     dv_path = None
 
     if src is None:
-        candidates = sorted(Path('processed_data').glob("*dv*_transformed.csv"))
+        candidates = tabular_io.glob_csv(Path('processed_data'), "*dv*_transformed")
         if not candidates:
-            candidates = sorted(Path('processed_data').glob("*dv*.csv"))
+            candidates = tabular_io.glob_csv(Path('processed_data'), "*dv*")
         if not candidates:
             candidates = [
                 Path('processed_data/_2023_2025_10_31_dv_fixed_transformed.xlsx'),
@@ -272,9 +297,9 @@ def main(src=None, out=None):
     else:
         src_path = Path(src)
         if src_path.is_dir():
-            matches = sorted(src_path.glob("*dv*_transformed.csv"))
+            matches = tabular_io.glob_csv(src_path, "*dv*_transformed")
             if not matches:
-                matches = sorted(src_path.glob("*dv*.csv"))
+                matches = tabular_io.glob_csv(src_path, "*dv*")
             if not matches:
                 matches = sorted(src_path.glob("*dv*_transformed.xlsx"))
             if not matches:
@@ -282,9 +307,9 @@ def main(src=None, out=None):
             if matches:
                 dv_path = matches[0]
             else:
-                fallback = sorted(Path('processed_data').glob("*dv*_transformed.csv"))
+                fallback = tabular_io.glob_csv(Path('processed_data'), "*dv*_transformed")
                 if not fallback:
-                    fallback = sorted(Path('processed_data').glob("*dv*.csv"))
+                    fallback = tabular_io.glob_csv(Path('processed_data'), "*dv*")
                 if not fallback:
                     fallback = sorted(Path('processed_data').glob("*dv*_transformed.xlsx"))
                 if not fallback:
@@ -309,7 +334,7 @@ def main(src=None, out=None):
         Path('raw_data/xlsx/_2023_2025_10_31_dv_rms.xlsx'),
     ]
     rms_file = None
-    for candidate in rms_candidates:
+    for candidate in map(tabular_io.find_csv, rms_candidates):
         if candidate.exists():
             rms_file = candidate
             break
@@ -317,7 +342,7 @@ def main(src=None, out=None):
         logger.error("Unable to locate RMS file. Checked: %s", rms_candidates)
         return
 
-    df_dv, df_rms = load_files(dv_path, rms_file)
+    df_dv, df_rms = load_files(dv_path, rms_file, config["rms_case_col"], config.get("location_columns"))
 
     # Show column info
     print("\n" + "="*80)
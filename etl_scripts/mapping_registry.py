@@ -0,0 +1,133 @@
+"""
+Process-wide registry for the CSV lookup tables in docs/mappings.
+
+Each table is read once per process and the lookups built from it (frozensets,
+dicts, value mappers) are cached alongside it. A table is re-read when its
+mtime or size changes, and its lookups are rebuilt only if the SHA-256 of the
+content changed too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAPPINGS_DIR = Path("docs/mappings")
+YES_NO_FILE = MAPPINGS_DIR / "yes_no_bool_map.csv"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+@dataclass
+class _Entry:
+    stat: Tuple[int, int]
+    sha256: str
+    frame: pd.DataFrame
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+_entries: Dict[Path, _Entry] = {}
+
+
+@dataclass(frozen=True)
+class BooleanVocab:
+    """Upper-cased truthy/falsy tokens from a yes/no mapping table."""
+
+    truthy: frozenset
+    falsy: frozenset
+
+    def map_series(self, series: pd.Series, missing: Any = False) -> pd.Series:
+        """
+        Map a Series to True/False, resolving each distinct value once.
+
+        Missing cells become ``missing``; values in neither vocabulary are kept.
+        """
+        codes, uniques = pd.factorize(series)
+        resolved = np.empty(len(uniques) + 1, dtype=object)
+        for i, value in enumerate(uniques):
+            token = str(value).strip().upper()
+            resolved[i] = True if token in self.truthy else False if token in self.falsy else value
+        resolved[-1] = missing  # factorize's NA sentinel (-1)
+        return pd.Series(resolved[codes], index=series.index, name=series.name).infer_objects()
+
+
+def _load(path: Path) -> Optional[_Entry]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _entries.pop(path, None)
+        return None
+    stat = (st.st_mtime_ns, st.st_size)
+    entry = _entries.get(path)
+    if entry is not None and entry.stat == stat:
+        return entry
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry is not None and entry.sha256 == digest:
+        entry.stat = stat
+        return entry
+    if entry is not None:
+        logger.info("Mapping %s changed on disk; reloading", path)
+    entry = _Entry(stat, digest, pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False))
+    _entries[path] = entry
+    return entry
+
+
+def lookup(path: Path, name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+    """
+    Return ``build(table)`` for the mapping CSV at ``path``, cached under ``name``
+    until the file changes. Returns None when the file does not exist.
+
+    The table is read with every column as ``str`` (blank cells are ``""``);
+    builders must not mutate it.
+    """
+    key = Path(path).resolve()
+    with _lock:
+        entry = _load(key)
+        if entry is None:
+            return None
+        if name not in entry.derived:
+            entry.derived[name] = build(entry.frame)
+        return entry.derived[name]
+
+
+def clear() -> None:
+    """Drop every cached table and lookup."""
+    with _lock:
+        _entries.clear()
+
+
+def _build_yes_no(frame: pd.DataFrame) -> BooleanVocab:
+    flags = frame["boolean"].str.strip().str.lower()
+    tokens = frame["raw"].str.strip().str.upper()
+    return BooleanVocab(frozenset(tokens[flags == "true"]), frozenset(tokens[flags == "false"]))
+
+
+def yes_no_vocab(path: Path = YES_NO_FILE) -> Optional[BooleanVocab]:
+    """Truthy/falsy vocabulary from ``yes_no_bool_map.csv``; None when the file is missing."""
+    return lookup(path, "yes_no", _build_yes_no)
+
+
+def _build_one_hot_groups(frame: pd.DataFrame):
+    groups: Dict[str, Dict[str, str]] = {}
+    for category, source, value in zip(
+        frame["category"].str.strip().str.lower(), frame["source"].str.strip(), frame["value"].str.strip()
+    ):
+        groups.setdefault(category, {})[source] = value
+    return MappingProxyType({k: MappingProxyType(v) for k, v in groups.items()})
+
+
+def one_hot_groups(path: Path) -> Optional[MappingProxyType]:
+    """Read-only {category: {flag_column: code}} from a one-hot mapping CSV, in file order."""
+    return lookup(path, "one_hot_groups", _build_one_hot_groups)
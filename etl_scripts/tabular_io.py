@@ -0,0 +1,122 @@
+"""Shared readers for the DV/RMS/CAD exports: CSV (plain or compressed), Parquet, Arrow and Excel."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Generator, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIXES = {".gz", ".zst"}
+EXCEL_SUFFIXES = {".xlsx", ".xlsm", ".xls"}
+
+
+def tabular_suffix(path: Path) -> str:
+    """
+    Lower-cased type suffix of ``path``, looking through a compression suffix:
+    compressed CSV exports (name.csv.gz / name.csv.zst) report ``.csv`` and
+    pandas infers the codec when reading them.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in COMPRESSED_SUFFIXES:
+        suffix = Path(path.stem).suffix.lower()
+    return suffix
+
+
+def tabular_stem(path: Path) -> str:
+    """File name without its type and compression suffixes (``x.csv.gz`` -> ``x``)."""
+    path = Path(path)
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        path = Path(path.stem)
+    return path.stem
+
+
+def glob_csv(directory: Path, pattern: str) -> list[Path]:
+    """Sorted plain or compressed CSV files in ``directory`` whose name matches ``pattern`` + ``.csv``."""
+    return sorted(path for path in Path(directory).glob(f"{pattern}.csv*") if tabular_suffix(path) == ".csv")
+
+
+def find_csv(path: Path) -> Path:
+    """``path`` (a plain ``.csv`` name), or its .gz/.zst sibling when only that was exported."""
+    path = Path(path)
+    if not path.exists():
+        for suffix in sorted(COMPRESSED_SUFFIXES):
+            compressed = path.with_name(path.name + suffix)
+            if compressed.exists():
+                return compressed
+    return path
+
+
+def read_tabular(
+    path: Path, columns: Optional[Iterable[str]] = None, nrows: Optional[int] = None, **csv_kwargs
+) -> pd.DataFrame:
+    """
+    Read CSV (preferred), typed Parquet/Arrow exports, or Excel data into a DataFrame.
+
+    ``columns`` limits the read to those names (absent ones are ignored) and
+    ``nrows`` to the first rows. CSV goes through the pyarrow engine when it
+    can, else the C parser; ``csv_kwargs`` are passed to ``read_csv``, and an
+    explicit ``engine`` skips the pyarrow attempt.
+    """
+    path = Path(path)
+    suffix = tabular_suffix(path)
+    wanted = set(columns) if columns is not None else None
+    if suffix == ".csv":
+        if wanted is not None:
+            csv_kwargs["usecols"] = lambda name: name in wanted
+        if nrows is not None:
+            csv_kwargs["nrows"] = nrows
+        if "engine" not in csv_kwargs:
+            try:
+                return pd.read_csv(path, engine="pyarrow", **csv_kwargs)
+            except (ImportError, ValueError):
+                logger.debug("pyarrow engine unavailable; falling back to default pandas CSV reader for %s", path)
+            csv_kwargs["low_memory"] = False
+        return pd.read_csv(path, **csv_kwargs)
+    if suffix == ".parquet":
+        if wanted is not None:
+            import pyarrow.parquet as pq
+
+            frame = pd.read_parquet(path, columns=[c for c in pq.read_schema(path).names if c in wanted])
+        else:
+            frame = pd.read_parquet(path)
+    elif suffix in {".arrow", ".feather"}:
+        frame = pd.read_feather(path)
+    elif suffix in EXCEL_SUFFIXES:
+        logger.warning("Reading Excel input %s; convert to CSV for faster processing if possible.", path)
+        frame = pd.read_excel(path, engine="openpyxl", nrows=nrows)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix} for {path}")
+    if wanted is not None:
+        frame = frame[[c for c in frame.columns if c in wanted]]
+    return frame.head(nrows) if nrows is not None else frame
+
+
+def iter_tabular_chunks(path: Path, chunksize: int, **csv_kwargs) -> Generator[pd.DataFrame, None, None]:
+    """Yield row blocks of CSV (incl. .gz/.zst), Parquet, or Arrow input; ``csv_kwargs`` go to ``read_csv``."""
+    path = Path(path)
+    suffix = tabular_suffix(path)
+    if suffix == ".csv":
+        # The pyarrow engine cannot stream; the C parser reads chunksize rows at a time
+        csv_kwargs.setdefault("low_memory", False)
+        with pd.read_csv(path, chunksize=chunksize, **csv_kwargs) as reader:
+            yield from reader
+    elif suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif suffix in {".arrow", ".feather"}:
+        import pyarrow as pa
+
+        # Memory-mapped, so only the batch being converted is materialised
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+            for batch in table.to_batches(max_chunksize=chunksize):
+                yield batch.to_pandas()
+    else:
+        raise ValueError(f"Chunked reads support CSV, Parquet, and Arrow input, not {path.suffix}")
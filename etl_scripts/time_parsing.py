@@ -0,0 +1,16 @@
+"""Shared parsers for the clock-time text found in the DV, RMS and CAD exports."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+
+def parse_clock_times(series: pd.Series) -> pd.Series:
+    """HH:MM[:SS] strings (or already-typed values) to time-of-day timedeltas."""
+    if pd.api.types.is_timedelta64_dtype(series):
+        return series
+    text = series.astype("string").str.strip()
+    parts = text.str.extract(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$").astype("float")
+    valid = (parts[0] <= 23) & (parts[1] <= 59) & (parts[2].fillna(0) <= 59)
+    seconds = (parts[0] * 3600 + parts[1] * 60 + parts[2].fillna(0)).where(valid)
+    return pd.to_timedelta(seconds, unit="s")
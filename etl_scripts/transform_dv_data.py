@@ -3,67 +3,189 @@ Enhanced DV Data Transformation
 Consolidates boolean columns into single categorical columns and fixes data types
 """
 
+import json
 import logging
+import os
 import re
 from datetime import datetime, time
 from pathlib import Path
+from time import perf_counter
 
+import numpy as np
 import pandas as pd
+import psutil
+from pandas.tseries.api import guess_datetime_format
 from zoneinfo import ZoneInfo
 
+from etl_scripts import backfill_dv, case_index, mapping_registry, tabular_io
+from etl_scripts.time_parsing import parse_clock_times
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 MAPPINGS_DIR = Path("docs/mappings")
 RACE_ETHNICITY_FILE = MAPPINGS_DIR / "race_ethnicity_map.csv"
+DAY_OF_WEEK_FILE = MAPPINGS_DIR / "day_of_week_map.csv"
 YES_NO_FILE = MAPPINGS_DIR / "yes_no_bool_map.csv"
 RMS_EXPORT_PATH = Path("raw_data/xlsx/output/_2023_2025_10_31_dv_rms.csv")
 CAD_EXPORT_PATH = Path("raw_data/xlsx/output/_2023_2025_10_31_dv_cad.csv")
 EASTERN = ZoneInfo("America/New_York")
+DAY_OF_WEEK_FLAGS = {
+    'Sunday': 'Sun',
+    'Monday': 'Mon',
+    'Tuesday': 'Tue',
+    'Wednesday': 'Wed',
+    'Thursday': 'Thu',
+    'Friday': 'Fri',
+    'Saturday': 'Sat',
+}
+DAY_OF_WEEK_TRUTHY = frozenset({'X', 'O', 'TRUE'})
+
+
+def load_one_hot_groups(path=RACE_ETHNICITY_FILE):
+    """Return {category: {flag_column: code}} from a one-hot mapping CSV, in file order."""
+    groups = mapping_registry.one_hot_groups(path)
+    if groups is None:
+        logger.warning("One-hot mapping file %s not found.", path)
+        return {}
+    return groups
 
 
 def load_race_ethnicity_mappings():
-    if not RACE_ETHNICITY_FILE.exists():
-        logger.warning("Race/Ethnicity mapping file %s not found.", RACE_ETHNICITY_FILE)
-        return {}, {}
-    df = pd.read_csv(RACE_ETHNICITY_FILE)
-    race = {
-        str(row["source"]).strip(): str(row["value"]).strip()
-        for _, row in df[df["category"].str.lower() == "race"].iterrows()
-    }
-    ethnicity = {
-        str(row["source"]).strip(): str(row["value"]).strip()
-        for _, row in df[df["category"].str.lower() == "ethnicity"].iterrows()
-    }
-    return race, ethnicity
+    groups = load_one_hot_groups()
+    return groups.get("race", {}), groups.get("ethnicity", {})
 
 
 def load_yes_no_mapping():
-    if not YES_NO_FILE.exists():
+    vocab = mapping_registry.yes_no_vocab(YES_NO_FILE)
+    if vocab is None:
         logger.warning("Yes/No mapping file %s not found.", YES_NO_FILE)
-        truthy = {"Y", "YES", "T", "TRUE", "1", "X", "O"}
-        falsy = {"N", "NO", "F", "FALSE", "0"}
-    else:
-        df = pd.read_csv(YES_NO_FILE)
-        truthy = {
-            str(v).strip().upper()
-            for v in df[df["boolean"].astype(str).str.lower() == "true"]["raw"]
-        }
-        falsy = {
-            str(v).strip().upper()
-            for v in df[df["boolean"].astype(str).str.lower() == "false"]["raw"]
-        }
-    return truthy, falsy
+        return frozenset({"Y", "YES", "T", "TRUE", "1", "X", "O"}), frozenset({"N", "NO", "F", "FALSE", "0"})
+    return vocab.truthy, vocab.falsy
 
 
-def to_eastern(series: pd.Series) -> pd.Series:
-    dt_series = pd.to_datetime(series, errors="coerce")
-    if getattr(dt_series.dt, "tz", None) is None:
+_DATE_SNIFF_SAMPLE = 50
+
+
+def _sniff_date_format(text: pd.Series) -> str | None:
+    """Most common format pandas guesses for a sample of the distinct strings."""
+    guesses = [guess_datetime_format(value) for value in text.head(_DATE_SNIFF_SAMPLE)]
+    guesses = [guess for guess in guesses if guess]
+    return max(set(guesses), key=guesses.count) if guesses else None
+
+
+# DataFrame.attrs key holding {column: format} pinned by sniff_date_formats
+DATE_FORMATS_ATTR = "date_formats"
+
+
+def _is_date_column(name) -> bool:
+    return name in ("c", "C") or str(name).endswith("Date")
+
+
+def sniff_date_formats(frames) -> dict[str, str]:
+    """
+    Date format for each column the steps pass to ``parse_dates``, sniffed from
+    the first distinct values in file order (the sample ``parse_dates`` would
+    take itself). Reading it off the leading blocks of a file lets a chunked
+    run parse every block with the format a full-file run picks.
+    """
+    samples: dict[str, list[str]] = {}
+    seen: dict[str, set] = {}
+    for frame in frames:
+        columns = [col for col in frame.columns if _is_date_column(col)]
+        for col in columns:
+            sample = samples.setdefault(col, [])
+            distinct = seen.setdefault(col, set())
+            for value in pd.unique(frame[col].dropna()):
+                if len(sample) >= _DATE_SNIFF_SAMPLE:
+                    break
+                if value in distinct:
+                    continue
+                distinct.add(value)
+                if isinstance(value, str) and value.strip():
+                    sample.append(value.strip())
+        if columns and all(len(samples[col]) >= _DATE_SNIFF_SAMPLE for col in columns):
+            break
+    renamed = {"c": "OffenseDate", "C": "OffenseDate"}
+    # "mixed" (per-value parsing) when nothing could be sniffed
+    return {
+        renamed.get(col, col): _sniff_date_format(pd.Series(sample, dtype=object)) or "mixed"
+        for col, sample in samples.items()
+    }
+
+
+def _pinned_format(df: pd.DataFrame, column: str) -> str | None:
+    return df.attrs.get(DATE_FORMATS_ATTR, {}).get(column)
+
+
+def _parse_unique_dates(uniques, date_format: str | None = None) -> pd.DatetimeIndex:
+    values = pd.Series(uniques, dtype=object)
+    is_text = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype=object)
+    if (~is_text).any():
+        parsed[~is_text] = list(pd.to_datetime(values[~is_text], errors="coerce"))
+    if is_text.any():
+        text = values[is_text].str.strip()
+        fmt = date_format or _sniff_date_format(text[text != ""])
+        if fmt:
+            dates = pd.to_datetime(text, format=fmt, errors="coerce", utc="%z" in fmt)
+        else:
+            dates = pd.Series(pd.NaT, index=text.index)
+        leftover = dates.isna() & (text != "")
+        if leftover.any():
+            # Values off the sniffed format (a minority) go through the per-value parser
+            dates = dates.astype(object)
+            dates[leftover] = list(pd.to_datetime(text[leftover], format="mixed", errors="coerce"))
+        parsed[is_text] = list(dates)
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(parsed, errors="coerce"))
+    except (TypeError, ValueError):
+        # Mixed offsets / naive values: compare in UTC
+        return pd.DatetimeIndex(pd.to_datetime(parsed, errors="coerce", utc=True))
+
+
+def parse_dates(series: pd.Series, date_format: str | None = None) -> tuple[pd.Series, int]:
+    """
+    Parse a column to America/New_York datetimes, parsing and localizing each distinct
+    value once. ``date_format`` overrides the format sniffed from the column (values
+    that don't match it still get the per-value parser). Returns the series and the
+    number of non-blank values that did not parse.
+    """
+    if series.empty:
+        return pd.Series(pd.DatetimeIndex([], tz=EASTERN), index=series.index, name=series.name), 0
+    codes, uniques = pd.factorize(series)
+    parsed = _parse_unique_dates(uniques, date_format)
+    if parsed.tz is None:
         try:
-            return dt_series.dt.tz_localize(EASTERN, nonexistent="NaT", ambiguous="NaT")
+            localized = parsed.tz_localize(EASTERN, nonexistent="NaT", ambiguous="NaT")
         except TypeError:
-            return dt_series.dt.tz_localize(EASTERN)
-    return dt_series.dt.tz_convert(EASTERN)
+            localized = parsed.tz_localize(EASTERN)
+    else:
+        localized = parsed.tz_convert(EASTERN)
+
+    blank = np.array([isinstance(value, str) and not value.strip() for value in uniques], dtype=bool)
+    failed = parsed.isna() & ~blank
+    unparseable = int(np.bincount(codes[codes >= 0], minlength=len(uniques))[failed].sum())
+    values = localized.array.take(codes, allow_fill=True)
+    return pd.Series(values, index=series.index, name=series.name), unparseable
+
+
+def to_eastern(series: pd.Series) -> pd.Series:
+    return parse_dates(series)[0]
+
+def to_timedelta(series: pd.Series) -> pd.Series:
+    """
+    ``pd.to_timedelta`` with unparseable values as NaT that also takes
+    datetime.time cells and HH:MM clock strings as times of day.
+    """
+    if series.dtype == object:
+        # The pyarrow CSV reader yields datetime.time cells, which to_timedelta rejects
+        series = series.map(lambda value: value.isoformat() if isinstance(value, time) else value)
+    td = pd.to_timedelta(series, errors="coerce")
+    retry = td.isna() & series.notna()
+    if retry.any():
+        td[retry] = parse_clock_times(series[retry])
+    return td
 
 def fix_offense_date_column(df):
     """Fix column 'c' or 'C' to be named 'OffenseDate' and ensure it's date-only"""
@@ -76,18 +198,63 @@ def fix_offense_date_column(df):
         df = df.rename(columns={'C': 'OffenseDate'})
     
     if 'OffenseDate' in df.columns:
-        # Ensure it's date-only (no time component)
-        if pd.api.types.is_datetime64_any_dtype(df['OffenseDate']):
-            # Convert to date object (date-only, no time)
-            df['OffenseDate'] = pd.to_datetime(df['OffenseDate']).dt.date
-            logger.info("Converted OffenseDate to date-only")
-        else:
-            # Try to parse as date
-            df['OffenseDate'] = pd.to_datetime(df['OffenseDate'], errors='coerce').dt.date
-            logger.info("Parsed and converted OffenseDate to date-only")
+        # Ensure it's date-only (no time component); parse_dates sniffs the column's
+        # format and parses each distinct value once
+        parsed, unparseable = parse_dates(df['OffenseDate'], _pinned_format(df, 'OffenseDate'))
+        df['OffenseDate'] = parsed.dt.date
+        logger.info("Parsed and converted OffenseDate to date-only")
+        if unparseable:
+            logger.warning("OffenseDate: %d values could not be parsed as dates", unparseable)
     
     return df
 
+def _flag_matrix(frame: pd.DataFrame, truthy) -> np.ndarray:
+    """Boolean matrix for a block of flag columns, normalising each distinct value once."""
+    codes, uniques = pd.factorize(frame.to_numpy(dtype=object).ravel())
+    lookup = np.zeros(len(uniques) + 1, dtype=bool)  # trailing slot catches the NA sentinel (-1)
+    for i, value in enumerate(uniques):
+        if isinstance(value, str):
+            lookup[i] = value.strip().upper() in truthy
+        else:
+            lookup[i] = value == True or str(value).strip().upper() in truthy
+    return lookup[codes].reshape(frame.shape)
+
+
+def collapse_one_hot(df, flag_mapping, target, truthy):
+    """
+    Collapse a group of one-hot flag columns into one categorical column.
+
+    ``flag_mapping`` is an ordered {flag_column: code}; when a row has several
+    flags set the first in mapping order wins. Adds ``<target>Flags``, a
+    multi-hot bitmask (bit i = i-th present flag column), logs how many rows
+    carried conflicting flags, and drops the flag columns.
+    """
+    flag_cols = [col for col in flag_mapping if col in df.columns]
+    if not flag_cols:
+        return df
+    matrix = _flag_matrix(df[flag_cols], truthy)
+    hits = matrix.any(axis=1)
+    label_codes, categories = pd.factorize(pd.Index([flag_mapping[col] for col in flag_cols]))
+    label_codes = np.append(label_codes, -1)  # trailing slot: no flag set
+    df[target] = pd.Categorical.from_codes(
+        label_codes[np.where(hits, matrix.argmax(axis=1), len(flag_cols))], categories=categories
+    )
+
+    width = len(flag_cols)
+    bit_dtype = np.uint8 if width <= 8 else np.uint16 if width <= 16 else np.uint32 if width <= 32 else np.uint64
+    weights = np.left_shift(np.ones(width, dtype=np.uint64), np.arange(width, dtype=np.uint64))
+    df[f"{target}Flags"] = (matrix.astype(np.uint64) @ weights).astype(bit_dtype)
+
+    conflicts = int((matrix.sum(axis=1) > 1).sum())
+    if conflicts:
+        logger.warning(
+            "%s: %d rows have more than one flag set; kept the first in mapping order (see %sFlags)",
+            target,
+            conflicts,
+            target,
+        )
+    return df.drop(columns=flag_cols)
+
 def consolidate_victim_race(df, race_mapping=None):
     """
     Consolidate VictimRace_X boolean columns into single VictimRace column
@@ -102,24 +269,8 @@ def consolidate_victim_race(df, race_mapping=None):
         return df
     
     logger.info(f"Consolidating {len(race_cols)} VictimRace columns into single column")
-    
-    # Create new consolidated column
-    df['VictimRace'] = None
-    
     truthy, _ = load_yes_no_mapping()
-
-    for col, code in race_mapping.items():
-        if col in df.columns:
-            # Check if value is True or X/O
-            mask = df[col] == True
-            if not mask.any():
-                # Try checking for X or O
-                mask = df[col].astype(str).str.strip().str.upper().isin(truthy)
-            
-            df.loc[mask, 'VictimRace'] = code
-    
-    # Drop old race columns
-    df = df.drop(columns=race_cols)
+    df = collapse_one_hot(df, race_mapping, 'VictimRace', truthy)
     logger.info(f"Dropped {len(race_cols)} old race columns")
     
     return df
@@ -129,8 +280,7 @@ def consolidate_victim_ethnicity(df, ethnicity_mapping=None):
     Consolidate VictimEthnic_H and VictimEthnic_NH into single VictimEthnicity column
     H = Hispanic, NH = Non-Hispanic
     """
-    _, ethnicity_defaults = load_race_ethnicity_mappings()
-    ethnicity_mapping = ethnicity_mapping or ethnicity_defaults
+    ethnicity_mapping = ethnicity_mapping or load_race_ethnicity_mappings()[1]
     ethnic_cols = [col for col in ethnicity_mapping.keys() if col in df.columns]
     
     if not ethnic_cols:
@@ -138,20 +288,8 @@ def consolidate_victim_ethnicity(df, ethnicity_mapping=None):
         return df
     
     logger.info(f"Consolidating {len(ethnic_cols)} VictimEthnic columns")
-    
-    df['VictimEthnicity'] = None
-    
     truthy, _ = load_yes_no_mapping()
-
-    for col, code in ethnicity_mapping.items():
-        if col in df.columns:
-            mask = df[col] == True
-            if not mask.any():
-                mask = df[col].astype(str).str.strip().str.upper().isin(truthy)
-            df.loc[mask, 'VictimEthnicity'] = code
-    
-    # Drop old columns
-    df = df.drop(columns=ethnic_cols)
+    df = collapse_one_hot(df, ethnicity_mapping, 'VictimEthnicity', truthy)
     logger.info(f"Dropped {len(ethnic_cols)} old ethnicity columns")
     
     return df
@@ -179,15 +317,7 @@ def consolidate_day_of_week(df):
     Options: Sun, Mon, Tue, Wed, Thu, Fri, Sat (or 1-7)
     Using abbreviated names: Sun, Mon, Tue, Wed, Thu, Fri, Sat
     """
-    dow_mapping = {
-        'Sunday': 'Sun',
-        'Monday': 'Mon',
-        'Tuesday': 'Tue',
-        'Wednesday': 'Wed',
-        'Thursday': 'Thu',
-        'Friday': 'Fri',
-        'Saturday': 'Sat',
-    }
+    dow_mapping = load_one_hot_groups(DAY_OF_WEEK_FILE).get('day_of_week') or DAY_OF_WEEK_FLAGS
     
     dow_cols = [col for col in dow_mapping.keys() if col in df.columns]
     
@@ -196,18 +326,7 @@ def consolidate_day_of_week(df):
         return df
     
     logger.info(f"Consolidating {len(dow_cols)} day of week columns")
-    
-    df['DayOfWeek'] = None
-    
-    for col, code in dow_mapping.items():
-        if col in df.columns:
-            mask = df[col] == True
-            if not mask.any():
-                mask = df[col].astype(str).str.strip().str.upper().isin(['X', 'O', 'TRUE'])
-            df.loc[mask, 'DayOfWeek'] = code
-    
-    # Drop old columns
-    df = df.drop(columns=dow_cols)
+    df = collapse_one_hot(df, dow_mapping, 'DayOfWeek', DAY_OF_WEEK_TRUTHY)
     logger.info(f"Dropped {len(dow_cols)} old day of week columns")
     
     return df
@@ -223,37 +342,35 @@ def drop_municipality_columns(df: pd.DataFrame) -> pd.DataFrame:
 def ensure_data_types(df):
     """Ensure proper data types for specific columns"""
     
+    unparseable = {}
+
     # OffenseDate should be date
     if 'OffenseDate' in df.columns:
-        localized = to_eastern(df['OffenseDate'])
+        localized, unparseable['OffenseDate'] = parse_dates(df['OffenseDate'], _pinned_format(df, 'OffenseDate'))
         df['OffenseDate'] = localized.dt.date
 
     # Normalize other *_Date columns to timezone-aware datetimes
     date_columns = [col for col in df.columns if col.endswith('Date') and col != 'OffenseDate']
     for column in date_columns:
-        localized = to_eastern(df[column])
-        df[column] = localized
+        df[column], unparseable[column] = parse_dates(df[column], _pinned_format(df, column))
+
+    for column, count in unparseable.items():
+        if count:
+            logger.warning("%s: %d values could not be parsed as dates", column, count)
     
     # Time should be time (or timedelta if already duration)
     if 'Time' in df.columns:
         if pd.api.types.is_timedelta64_dtype(df['Time']):
             logger.info("Time column is already timedelta64 (duration)")
         else:
-            # Try to convert to time
-            try:
-                df['Time'] = pd.to_timedelta(df['Time'])
-                logger.info("Converted Time to timedelta64")
-            except:
-                logger.warning("Could not convert Time to timedelta")
+            df['Time'] = to_timedelta(df['Time'])
+            logger.info("Converted Time to timedelta64")
     
     # TotalTime should be duration (timedelta)
     if 'TotalTime' in df.columns:
         if not pd.api.types.is_timedelta64_dtype(df['TotalTime']):
-            try:
-                df['TotalTime'] = pd.to_timedelta(df['TotalTime'])
-                logger.info("Converted TotalTime to timedelta64")
-            except:
-                logger.warning("Could not convert TotalTime to timedelta")
+            df['TotalTime'] = to_timedelta(df['TotalTime'])
+            logger.info("Converted TotalTime to timedelta64")
         else:
             logger.info("TotalTime is already timedelta64 (duration)")
     
@@ -261,7 +378,8 @@ def ensure_data_types(df):
     if 'VictimAge' in df.columns:
         if df['VictimAge'].dtype == 'object':
             # Try to convert to numeric
-            df['VictimAge'] = pd.to_numeric(df['VictimAge'], errors='coerce')
+            # Always float, so every chunk of a streamed run writes ages alike
+            df['VictimAge'] = pd.to_numeric(df['VictimAge'], errors='coerce').astype(float)
             logger.info("Converted VictimAge to numeric")
         else:
             logger.info(f"VictimAge is already numeric: {df['VictimAge'].dtype}")
@@ -269,19 +387,15 @@ def ensure_data_types(df):
     return df
 
 
-def _load_reference_csv(path: Path, required_columns: set[str]) -> pd.DataFrame | None:
-    if not path.exists():
-        logger.warning("Reference file %s not found; skipping backfill.", path)
+def _reference_index(path: Path, kind: str, required_columns: set[str]) -> pd.DataFrame | None:
+    index = case_index.load_case_index(tabular_io.find_csv(path), kind)
+    if index is None:
         return None
-    try:
-        ref_df = pd.read_csv(path, engine="pyarrow")
-    except (ImportError, ValueError):
-        ref_df = pd.read_csv(path, low_memory=False)
-    missing = required_columns.difference(ref_df.columns)
+    missing = required_columns.difference(index.columns)
     if missing:
         logger.warning("Reference file %s missing columns: %s", path, ", ".join(sorted(missing)))
         return None
-    return ref_df
+    return index
 
 
 def backfill_temporal_fields(df: pd.DataFrame) -> pd.DataFrame:
@@ -290,50 +404,33 @@ def backfill_temporal_fields(df: pd.DataFrame) -> pd.DataFrame:
         logger.warning("CaseNumber column missing; cannot backfill temporal fields.")
         return df
 
-    case_key = df["CaseNumber"].astype(str).str.strip()
+    case_key = case_index.normalize_case_numbers(df["CaseNumber"])
 
     offense_dates = pd.to_datetime(df.get("OffenseDate"), errors="coerce")
-    time_values = pd.to_timedelta(df.get("Time"), errors="coerce")
+    time_source = df["Time"] if "Time" in df.columns else pd.Series(pd.NaT, index=df.index, dtype="timedelta64[ns]")
+    time_values = to_timedelta(time_source)
     day_values = df.get("DayOfWeek").astype("string") if "DayOfWeek" in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
 
     offense_missing = offense_dates.isna()
     time_missing = time_values.isna() | (time_values == pd.Timedelta(0))
     day_missing = day_values.isna() | (day_values.str.strip() == "")
 
-    rms_df = _load_reference_csv(RMS_EXPORT_PATH, {"Case Number", "Incident Date", "Incident Time"})
-    if rms_df is not None:
-        rms_df["_case_key"] = rms_df["Case Number"].astype(str).str.strip()
-        rms_df["_incident_date"] = pd.to_datetime(rms_df["Incident Date"], errors="coerce")
-        rms_df["_incident_time"] = pd.to_timedelta(rms_df["Incident Time"], errors="coerce")
-        rms_df["_incident_dow"] = rms_df["_incident_date"].dt.day_name().str[:3]
-
-        date_map = rms_df.dropna(subset=["_incident_date"]).set_index("_case_key")["_incident_date"].to_dict()
-        time_map = rms_df.dropna(subset=["_incident_time"]).set_index("_case_key")["_incident_time"].to_dict()
-        dow_map = rms_df.dropna(subset=["_incident_dow"]).set_index("_case_key")["_incident_dow"].to_dict()
-
-        offense_dates[offense_missing] = case_key.map(date_map)[offense_missing]
-        time_values[time_missing] = case_key.map(time_map)[time_missing]
-        day_values[day_missing] = case_key.map(dow_map)[day_missing]
+    rms = _reference_index(RMS_EXPORT_PATH, "rms", {"Incident Date", "Incident Time"})
+    if rms is not None:
+        offense_dates[offense_missing] = case_key.map(rms["Incident Date"])[offense_missing]
+        time_values[time_missing] = case_key.map(rms["Incident Time"])[time_missing]
+        day_values[day_missing] = case_key.map(rms["Incident Date"].dt.day_name().str[:3])[day_missing]
 
         offense_missing = offense_dates.isna()
         time_missing = time_values.isna() | (time_values == pd.Timedelta(0))
         day_missing = day_values.isna() | (day_values.str.strip() == "")
 
-    cad_df = _load_reference_csv(CAD_EXPORT_PATH, {"ReportNumberNew", "Time of Call", "DayofWeek"})
-    if cad_df is not None:
-        cad_df["_case_key"] = cad_df["ReportNumberNew"].astype(str).str.strip()
-        cad_dt = pd.to_datetime(cad_df["Time of Call"], errors="coerce")
-        cad_df["_call_date"] = cad_dt.dt.normalize()
-        cad_df["_call_time"] = pd.to_timedelta(cad_dt.dt.strftime("%H:%M:%S"), errors="coerce")
-        cad_df["_call_dow"] = cad_df["DayofWeek"].astype(str).str.strip().str[:3]
-
-        cad_date_map = cad_df.dropna(subset=["_call_date"]).set_index("_case_key")["_call_date"].to_dict()
-        cad_time_map = cad_df.dropna(subset=["_call_time"]).set_index("_case_key")["_call_time"].to_dict()
-        cad_dow_map = cad_df.dropna(subset=["_call_dow"]).set_index("_case_key")["_call_dow"].to_dict()
-
-        offense_dates[offense_missing] = case_key.map(cad_date_map)[offense_missing]
-        time_values[time_missing] = case_key.map(cad_time_map)[time_missing]
-        day_values[day_missing] = case_key.map(cad_dow_map)[day_missing]
+    cad = _reference_index(CAD_EXPORT_PATH, "cad", {"Time of Call", "DayofWeek"})
+    if cad is not None:
+        call_dates = cad["Time of Call"].dt.normalize()
+        offense_dates[offense_missing] = case_key.map(call_dates)[offense_missing]
+        time_values[time_missing] = case_key.map(cad["Time of Call"] - call_dates)[time_missing]
+        day_values[day_missing] = case_key.map(cad["DayofWeek"].str.strip().str[:3])[day_missing]
 
     df["OffenseDate"] = offense_dates.dt.date
     if "Time" in df.columns:
@@ -348,127 +445,239 @@ def backfill_temporal_fields(df: pd.DataFrame) -> pd.DataFrame:
 
 def normalize_death_flags(df: pd.DataFrame) -> pd.DataFrame:
     """Convert death indicator columns to boolean."""
-    death_cols = [col for col in ("JuvDeaths_M", "AdultDeaths_M", "AdultDeaths_F", "JuvDeaths_F") if col in df.columns]
+    death_cols = [col for col in backfill_dv.CONFIG.death_columns if col in df.columns]
     for col in death_cols:
-        series = df[col]
-        df[col] = (
-            series.replace({"0": 0, "1": 1})
-            .astype("float")
-            .apply(lambda x: None if pd.isna(x) else bool(int(x)))
-            .astype("boolean")
-        )
+        df[col] = backfill_dv.death_counts(df[col]).astype("boolean")
     if death_cols:
         logger.info("Normalised death indicator columns to boolean: %s", ", ".join(death_cols))
     return df
 
 
+_TWO_DIGITS = np.array([f"{i:02d}" for i in range(100)], dtype=object)
+
+
+def _format_hms(series: pd.Series) -> pd.Series:
+    """Format timedelta-like values as zero-padded HH:MM:SS; unparseable values become <NA>."""
+    td = to_timedelta(series)
+    valid = td.notna().to_numpy()
+    # total_seconds is resolution-independent (timedelta64[s]/[us]/[ns] alike)
+    seconds_float = td.dt.total_seconds().to_numpy(dtype=float, na_value=0.0)
+    total = np.trunc(seconds_float).astype(np.int64)  # whole seconds, truncated toward zero
+    hours, remainder = np.divmod(total, 3600)
+    minutes, seconds = np.divmod(remainder, 60)
+
+    hour_text = np.empty(len(total), dtype=object)
+    two_digit = (hours >= 0) & (hours < 100)
+    hour_text[two_digit] = _TWO_DIGITS[hours[two_digit]]
+    hour_text[~two_digit] = [f"{h:02d}" for h in hours[~two_digit]]
+    text = hour_text + ":" + _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
+    text[~valid] = None
+    return pd.Series(text, index=series.index, name=series.name, dtype="string")
+
+
 def format_time_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Convert timedelta columns to HH:MM:SS string format for readability."""
-    def _format_td(value) -> str | None:
-        if pd.isna(value):
-            return None
-        td = pd.to_timedelta(value, errors="coerce")
-        if pd.isna(td):
-            return None
-        total_seconds = int(td.total_seconds())
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
     for col in ("Time", "TotalTime"):
         if col in df.columns:
-            df[col] = df[col].apply(_format_td).astype("string")
+            df[col] = _format_hms(df[col])
     return df
 
 
-def _load_tabular(input_path: Path) -> pd.DataFrame:
-    """Load CSV (preferred) or Excel input into a DataFrame."""
-    suffix = input_path.suffix.lower()
-    if suffix == ".csv":
-        try:
-            return pd.read_csv(input_path, engine="pyarrow")
-        except (ImportError, ValueError):
-            return pd.read_csv(input_path, low_memory=False)
-    if suffix in {".xlsx", ".xlsm", ".xls"}:
-        logger.warning(
-            "Reading Excel input %s; consider converting to CSV for faster processing.",
-            input_path,
-        )
-        return pd.read_excel(input_path, engine="openpyxl")
-    raise ValueError(f"Unsupported input format for DV data: {input_path.suffix}")
-
-
-def process_dv_file(input_file, output_file=None):
+TRANSFORM_STEPS = (
+    fix_offense_date_column,
+    consolidate_victim_race,
+    consolidate_victim_ethnicity,
+    rename_sex_columns,
+    consolidate_day_of_week,
+    drop_municipality_columns,
+    backfill_temporal_fields,
+    ensure_data_types,
+    normalize_death_flags,
+    format_time_columns,
+)
+STEP_NAMES = tuple(step.__name__ for step in TRANSFORM_STEPS)
+
+
+def resolve_steps(steps=None, skip=None):
+    """Pick transform steps by name (default order: TRANSFORM_STEPS), minus any in ``skip``."""
+    by_name = dict(zip(STEP_NAMES, TRANSFORM_STEPS))
+    names = list(steps) if steps else list(STEP_NAMES)
+    unknown = [name for name in (*names, *(skip or ())) if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown transform step(s): {', '.join(unknown)}. Available: {', '.join(STEP_NAMES)}")
+    return [by_name[name] for name in names if name not in set(skip or ())]
+
+
+def run_steps(df: pd.DataFrame, steps) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Apply ``steps`` in order under pandas copy-on-write, so renames/drops and
+    untouched columns share memory with the input instead of being copied.
+    Returns the frame and one timing record per step.
+    """
+    process = psutil.Process()
+    report = []
+    with pd.option_context("mode.copy_on_write", True):
+        for step in steps:
+            rows_in, cols_in = df.shape
+            rss_before = process.memory_info().rss
+            start = perf_counter()
+            df = step(df)
+            seconds = perf_counter() - start
+            rss_delta = process.memory_info().rss - rss_before
+            report.append({
+                "step": step.__name__,
+                "seconds": round(seconds, 4),
+                "rows_in": rows_in,
+                "rows_out": len(df),
+                "cols_in": cols_in,
+                "cols_out": len(df.columns),
+                "rss_delta_mb": round(rss_delta / (1024 * 1024), 1),
+            })
+            logger.info(
+                "Step %s: %.3fs, rows %d -> %d, cols %d -> %d, RSS %+.1f MB",
+                step.__name__, seconds, rows_in, len(df), cols_in, len(df.columns), rss_delta / (1024 * 1024),
+            )
+    return df, report
+
+
+# Full and chunked runs read CSV alike: the C parser (the one that can stream) with
+# every column as text, so the steps see the same values whatever the block size
+CSV_READ_OPTIONS = {"engine": "c", "dtype": str}
+
+
+def _merge_step_reports(totals: list[dict], report: list[dict]) -> list[dict]:
+    if not totals:
+        return [{**entry, "chunks": 1} for entry in report]
+    for total, entry in zip(totals, report):
+        total["seconds"] = round(total["seconds"] + entry["seconds"], 4)
+        total["rows_in"] += entry["rows_in"]
+        total["rows_out"] += entry["rows_out"]
+        total["rss_delta_mb"] = max(total["rss_delta_mb"], entry["rss_delta_mb"])
+        total["chunks"] += 1
+    return totals
+
+
+def _transform_chunked(input_path: Path, output_path: Path, pipeline, chunksize: int):
+    """Stream ``input_path`` through ``pipeline`` in row blocks, appending to a CSV."""
+    # Build (or load) the RMS/CAD case index once, before the first block needs it
+    if backfill_temporal_fields in pipeline:
+        case_index.load_case_index(tabular_io.find_csv(RMS_EXPORT_PATH), "rms")
+        case_index.load_case_index(tabular_io.find_csv(CAD_EXPORT_PATH), "cad")
+
+    # Pin date formats from the leading blocks so each block parses like the whole file
+    blocks = tabular_io.iter_tabular_chunks(input_path, chunksize, **CSV_READ_OPTIONS)
+    try:
+        date_formats = sniff_date_formats(blocks)
+    finally:
+        blocks.close()
+
+    part_path = output_path.with_name(output_path.name + ".part")
+    report: list[dict] = []
+    columns = None
+    rows = 0
+    try:
+        with open(part_path, "w", newline="", encoding="utf-8") as out:
+            for chunk in tabular_io.iter_tabular_chunks(input_path, chunksize, **CSV_READ_OPTIONS):
+                chunk.attrs[DATE_FORMATS_ATTR] = date_formats
+                chunk, chunk_report = run_steps(chunk, pipeline)
+                if columns is None:
+                    columns = list(chunk.columns)
+                elif list(chunk.columns) != columns:
+                    if set(chunk.columns) != set(columns):
+                        raise ValueError(
+                            f"Block at row {rows} produced different columns: {sorted(set(chunk.columns) ^ set(columns))}"
+                        )
+                    chunk = chunk[columns]
+                chunk.to_csv(out, header=rows == 0, index=False)
+                rows += len(chunk)
+                report = _merge_step_reports(report, chunk_report)
+                logger.info("Wrote %d rows so far", rows)
+        os.replace(part_path, output_path)
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+    return rows, columns or [], report
+
+
+def process_dv_file(input_file, output_file=None, steps=None, skip_steps=None, chunksize=None):
     """
     Process the DV file with all transformations
+
+    ``steps`` reorders/limits the transform steps by name and ``skip_steps``
+    drops some; per-step timings are written next to the output as
+    ``<output stem>_steps.json``. With ``chunksize`` the file is streamed in
+    row blocks to a CSV output and None is returned instead of the frame.
     """
+    pipeline = resolve_steps(steps, skip_steps)
     logger.info(f"Processing {input_file}")
-    
-    # Read the file
     input_path = Path(input_file)
-    df = _load_tabular(input_path)
-    logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
-    
-    original_cols = len(df.columns)
-    
-    # Apply transformations in order
-    df = fix_offense_date_column(df)
-    race_map, ethnicity_map = load_race_ethnicity_mappings()
-    df = consolidate_victim_race(df, race_map)
-    df = consolidate_victim_ethnicity(df, ethnicity_map)
-    df = rename_sex_columns(df)
-    df = consolidate_day_of_week(df)
-    df = drop_municipality_columns(df)
-    df = backfill_temporal_fields(df)
-    df = ensure_data_types(df)
-    df = normalize_death_flags(df)
-    df = format_time_columns(df)
-    
-    logger.info(f"Reduced from {original_cols} to {len(df.columns)} columns")
     
-    # Save output
     if output_file is None:
-        output_file = Path('processed_data') / f"{input_path.stem}_transformed.csv"
+        output_file = Path('processed_data') / f"{tabular_io.tabular_stem(input_path)}_transformed.csv"
     
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    
     suffix = output_path.suffix.lower()
-    logger.info(f"Saving to {output_path}")
-    
-    if suffix == ".csv" or suffix == "":
-        if suffix == "":
-            output_path = output_path.with_suffix(".csv")
-        if output_path.exists():
-            try:
-                output_path.unlink()
-            except PermissionError:
-                logger.warning("Could not remove existing output %s before write; attempting to overwrite directly.", output_path)
-        df.to_csv(output_path, index=False)
-    elif suffix in {".xlsx", ".xlsm", ".xls"}:
-        df.to_excel(output_path, index=False, engine='openpyxl')
+    if suffix == "":
+        output_path = output_path.with_suffix(".csv")
+        suffix = ".csv"
+    
+    if chunksize:
+        if suffix != ".csv":
+            raise ValueError(f"Chunked transform writes CSV output, not {output_path.suffix}")
+        logger.info(f"Streaming in blocks of {chunksize} rows to {output_path}")
+        rows, columns, step_report = _transform_chunked(input_path, output_path, pipeline, chunksize)
+        logger.info(f"Wrote {rows} rows, {len(columns)} columns")
+        df = None
     else:
-        raise ValueError(f"Unsupported output format: {output_path.suffix}")
+        # Read the file
+        df = tabular_io.read_tabular(input_path, **CSV_READ_OPTIONS)
+        logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+        df.attrs[DATE_FORMATS_ATTR] = sniff_date_formats([df])
+        
+        original_cols = len(df.columns)
+        
+        df, step_report = run_steps(df, pipeline)
+        
+        logger.info(f"Reduced from {original_cols} to {len(df.columns)} columns")
+        
+        # Save output
+        logger.info(f"Saving to {output_path}")
+        
+        if suffix == ".csv":
+            if output_path.exists():
+                try:
+                    output_path.unlink()
+                except PermissionError:
+                    logger.warning("Could not remove existing output %s before write; attempting to overwrite directly.", output_path)
+            df.to_csv(output_path, index=False)
+        elif suffix in {".xlsx", ".xlsm", ".xls"}:
+            df.to_excel(output_path, index=False, engine='openpyxl')
+        else:
+            raise ValueError(f"Unsupported output format: {output_path.suffix}")
+    
+    report_path = output_path.with_name(f"{output_path.stem}_steps.json")
+    report_path.write_text(json.dumps(step_report, indent=2), encoding="utf-8")
     
     return df
 
-def main(src=None, out=None):
+def main(src=None, out=None, steps=None, skip_steps=None, chunksize=None):
     """Main function"""
     if src is None:
-        candidates = list(Path('processed_data').glob("*_dv_fixed*.csv"))
+        candidates = tabular_io.glob_csv(Path('processed_data'), "*_dv_fixed*")
         if not candidates:
             candidates = list(Path('processed_data').glob("*_dv_fixed*.xlsx"))
-        input_file = candidates[0] if candidates else Path('processed_data/_2023_2025_10_31_dv_fixed.csv')
+        input_file = candidates[0] if candidates else tabular_io.find_csv(Path('processed_data/_2023_2025_10_31_dv_fixed.csv'))
     else:
         src_path = Path(src)
         if src_path.is_dir():
-            candidates = sorted(src_path.glob("*dv*.csv"))
+            candidates = tabular_io.glob_csv(src_path, "*dv*")
             if not candidates:
                 candidates = sorted(src_path.glob("*dv*.xlsx"))
             if candidates:
                 input_file = candidates[0]
             else:
-                fallback = sorted(Path('processed_data').glob("*dv*.csv"))
+                fallback = tabular_io.glob_csv(Path('processed_data'), "*dv*")
                 if not fallback:
                     fallback = sorted(Path('processed_data').glob("*dv*.xlsx"))
                 if fallback:
@@ -491,18 +700,23 @@ def main(src=None, out=None):
 
     output_dir = Path(out) if out else Path('processed_data')
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / f"{input_file.stem}_transformed.csv"
+    output_file = output_dir / f"{tabular_io.tabular_stem(input_file)}_transformed.csv"
 
     print("="*80)
     print("DV DATA TRANSFORMATION")
     print("="*80)
 
-    df = process_dv_file(input_file, output_file=output_file)
+    df = process_dv_file(
+        input_file, output_file=output_file, steps=steps, skip_steps=skip_steps, chunksize=chunksize
+    )
 
     print("\n" + "="*80)
     print("TRANSFORMATION COMPLETE")
     print("="*80)
     print(f"\nOutput saved to: {output_file}")
+    if df is None:
+        # Streamed in blocks; the full frame was never held in memory
+        return
     print(f"\nFinal column count: {len(df.columns)}")
     print(f"\nKey consolidated columns:")
     if 'VictimRace' in df.columns:
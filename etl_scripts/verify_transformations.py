@@ -8,6 +8,8 @@ from typing import Dict, Any
 
 import pandas as pd
 
+from etl_scripts import tabular_io
+
 DEFAULT_INPUT = Path("processed_data")
 DEFAULT_OUTPUT = Path("logs")
 
@@ -15,9 +17,9 @@ DEFAULT_OUTPUT = Path("logs")
 def _select_input_file(src: Path) -> Path:
     if src.is_file():
         return src
-    candidates = sorted(src.glob("*_dv_fixed_transformed.csv"))
+    candidates = tabular_io.glob_csv(src, "*_dv_fixed_transformed")
     if not candidates:
-        candidates = sorted(src.glob("*_transformed.csv"))
+        candidates = tabular_io.glob_csv(src, "*_transformed")
     if not candidates:
         candidates = sorted(src.glob("*_dv_fixed_transformed.xlsx"))
     if not candidates:
@@ -27,18 +29,6 @@ def _select_input_file(src: Path) -> Path:
     return candidates[0]
 
 
-def _load_tabular(path: Path) -> pd.DataFrame:
-    suffix = path.suffix.lower()
-    if suffix == ".csv":
-        try:
-            return pd.read_csv(path, engine="pyarrow")
-        except (ImportError, ValueError):
-            return pd.read_csv(path, low_memory=False)
-    if suffix in {".xlsx", ".xlsm", ".xls"}:
-        return pd.read_excel(path, engine="openpyxl")
-    raise ValueError(f"Unsupported input format: {path}")
-
-
 def _column_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     metrics: Dict[str, Any] = {}
     total_records = len(df)
@@ -85,7 +75,7 @@ def main(src=None, out=None) -> Path | None:
         print(exc)
         return None
 
-    df = _load_tabular(input_file)
+    df = tabular_io.read_tabular(input_file)
     report = build_report(df)
     report_path = out_dir / "verify_report.json"
     report_path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
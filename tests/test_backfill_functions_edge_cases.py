@@ -213,3 +213,39 @@ def test_rms_in_place_backfill():
     assert r1["OffenseDate"] == "2023-01-02"
     assert pd.to_timedelta(r1["Time"]).total_seconds() == 51730
     assert r1["FullAddress"] == "200 Elm St"
+
+
+def test_death_counts_shared_normalizer():
+    from etl_scripts import transform_dv_data
+    from etl_scripts.backfill_dv import death_counts
+
+    raw = pd.Series(["True", "False", " 2 ", "x", None, -1, 1.0, True], name="JuvDeaths_M")
+    counts = death_counts(raw)
+    assert str(counts.dtype) == "Int8"
+    assert counts.tolist() == [1, 0, 2, pd.NA, pd.NA, -1, 1, 1]
+    assert death_counts(counts) is counts
+
+    flags = transform_dv_data.normalize_death_flags(pd.DataFrame({"JuvDeaths_M": raw}))["JuvDeaths_M"]
+    assert flags.tolist() == [True, False, True, pd.NA, pd.NA, True, True, True]
+
+    cleaned = clean_deaths(pd.DataFrame({"JuvDeaths_M": raw}))
+    assert cleaned["JuvDeaths_M"].tolist() == [1, 0, 2, 0, 0, -1, 1, 1]
+
+
+def test_final_cleanup_keeps_categoricals():
+    from etl_scripts.backfill_dv import final_cleanup
+
+    df = pd.DataFrame(
+        {
+            "CaseNumber": ["23-000001", "23-000002", "23-000003"],
+            "PDZone": pd.Categorical(["Z1 ", "Z1", None]),
+            "Officer": [" P.O. Smith", "P.O. Jones", None],
+            "OffenseDate": ["2023-01-01", None, None],
+            "Time": ["00:30:00", None, None],
+        }
+    )
+    result = final_cleanup(df)
+    assert isinstance(result["PDZone"].dtype, pd.CategoricalDtype)
+    assert list(result["PDZone"].cat.categories) == ["Z1"]
+    assert result["PDZone"].tolist()[:2] == ["Z1", "Z1"] and pd.isna(result["PDZone"].iloc[2])
+    assert result["Officer"].tolist()[:2] == ["P.O. Smith", "P.O. Jones"]
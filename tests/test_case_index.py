@@ -0,0 +1,115 @@
+import os
+
+import pandas as pd
+import pytest
+
+from etl_scripts import case_index, transform_dv_data
+
+pytest.importorskip("pyarrow")
+
+
+def _write_rms(path, rows):
+    pd.DataFrame(rows, columns=["Case Number", "Incident Date", "Incident Time", "FullAddress"]).to_csv(
+        path, index=False
+    )
+
+
+def test_case_index_persists_and_rebuilds_on_change(tmp_path, monkeypatch) -> None:
+    rms_path = tmp_path / "rms.csv"
+    _write_rms(
+        rms_path,
+        [
+            [" 23-000001", "2023-01-01", "9:05", None],
+            ["23-000001", "2023-01-03", "10:00:00", "100 Main St"],
+            ["23-000002", "bad", "25:00", "200 Elm St"],
+        ],
+    )
+    index = case_index.load_case_index(rms_path, "rms")
+    stored = case_index.index_path(rms_path, "rms")
+    assert stored.exists()
+    assert index.loc["23-000001", "Incident Date"] == pd.Timestamp("2023-01-01")
+    assert index.loc["23-000001", "Incident Time"] == pd.Timedelta(minutes=545)
+    assert index.loc["23-000001", "FullAddress"] == "100 Main St"
+    assert pd.isna(index.loc["23-000002", "Incident Date"])
+    assert pd.isna(index.loc["23-000002", "Incident Time"])
+
+    # A fresh process reads the stored index; a touched-but-identical source is not re-parsed
+    case_index._memo.clear()
+    st = rms_path.stat()
+    os.utime(rms_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(case_index, "build_case_index", lambda *a: pytest.fail("index rebuilt"))
+    pd.testing.assert_frame_equal(case_index.load_case_index(rms_path, "rms"), index)
+    monkeypatch.undo()
+
+    _write_rms(rms_path, [["23-000003", "2024-02-29", "23:59", "300 Oak St"]])
+    os.utime(rms_path, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert case_index.load_case_index(rms_path, "rms").index.tolist() == ["23-000003"]
+
+
+def test_backfill_temporal_fields_uses_case_index(tmp_path, monkeypatch) -> None:
+    rms_path = tmp_path / "rms.csv"
+    cad_path = tmp_path / "cad.csv"
+    _write_rms(rms_path, [["23-000001", "2023-01-01", "00:30:00", "100 Main St"]])
+    pd.DataFrame(
+        [["23-000002", "01/02/2023 14:22", "Monday"]], columns=["ReportNumberNew", "Time of Call", "DayofWeek"]
+    ).to_csv(cad_path, index=False)
+    monkeypatch.setattr(transform_dv_data, "RMS_EXPORT_PATH", rms_path)
+    monkeypatch.setattr(transform_dv_data, "CAD_EXPORT_PATH", cad_path)
+
+    df = pd.DataFrame({"CaseNumber": ["23-000001", "23-000002 "], "OffenseDate": [None, None], "Time": [None, None]})
+    out = transform_dv_data.backfill_temporal_fields(df)
+    assert [str(d) for d in out["OffenseDate"]] == ["2023-01-01", "2023-01-02"]
+    assert out["Time"].tolist() == [pd.Timedelta(minutes=30), pd.Timedelta(hours=14, minutes=22)]
+    assert out["DayOfWeek"].tolist() == ["Sun", "Mon"]
+
+
+def test_map_case_numbers_joins_first_non_null_rms_values() -> None:
+    from etl_scripts.map_dv_to_rms_locations import map_case_numbers
+
+    dv = pd.DataFrame({"CaseNumber": [" 23-000001", "23-00000a", None], "VictimAge": [30, 41, 52]})
+    rms = pd.DataFrame(
+        {
+            "Case Number": ["23-000001", "23-00000A ", "23-00000A", None],
+            "FullAddress": ["100 Main St", None, "200 Elm St", "orphan"],
+            "Zone": ["Z1", "Z2", "Z3", "Z4"],  # not an indexed column; must survive the join
+        }
+    )
+    merged = map_case_numbers(dv, rms)
+    assert len(merged) == 3
+    # Same rule as the case index: first non-null value per column, per case
+    assert merged["FullAddress"].tolist()[:2] == ["100 Main St", "200 Elm St"]
+    assert merged["Zone"].tolist()[:2] == ["Z1", "Z2"]
+    assert pd.isna(merged["Zone"].iloc[2])
+    assert merged["CaseNumber"].tolist()[:2] == [" 23-000001", "23-00000a"]
+    assert "case_key" not in merged.columns
+
+
+def test_load_files_reads_rms_locations_from_case_index(tmp_path, monkeypatch) -> None:
+    from etl_scripts import map_dv_to_rms_locations
+
+    rms_path = tmp_path / "rms.csv"
+    pd.DataFrame(
+        {
+            "Case Number": ["23-000001", "23-000001", "23-000002"],
+            "FullAddress": [None, "100 Main St", "200 Elm St"],
+            "Zone": ["Z1", "Z9", None],
+        }
+    ).to_csv(rms_path, index=False)
+    dv_path = tmp_path / "dv.csv"
+    pd.DataFrame({"CaseNumber": ["23-000001", "23-000002"]}).to_csv(dv_path, index=False)
+    case_index.load_case_index(rms_path, "rms")
+
+    reads = []
+    read_tabular = map_dv_to_rms_locations.tabular_io.read_tabular
+    monkeypatch.setattr(
+        map_dv_to_rms_locations.tabular_io,
+        "read_tabular",
+        lambda path, **kwargs: reads.append((path, kwargs.get("columns"))) or read_tabular(path, **kwargs),
+    )
+    _, df_rms = map_dv_to_rms_locations.load_files(dv_path, rms_path, "Case Number", ["FullAddress", "Zone"])
+
+    # Only the column the index lacks is read from the export
+    assert reads == [(dv_path, None), (rms_path, ["Case Number", "Zone"])]
+    assert df_rms["Case Number"].tolist() == ["23-000001", "23-000002"]
+    assert df_rms["FullAddress"].tolist() == ["100 Main St", "200 Elm St"]
+    assert df_rms["Zone"].tolist()[0] == "Z1" and pd.isna(df_rms["Zone"].iloc[1])
@@ -0,0 +1,41 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from etl_scripts.dtype_optimizer import optimize_dtypes, smallest_int_dtype
+
+
+def test_optimize_dtypes_categorises_and_downcasts(caplog) -> None:
+    n = 100
+    df = pd.DataFrame(
+        {
+            "CaseNumber": [f"23-{i:06d}" for i in range(n)],
+            "PDZone": ["Z1", "Z2", None, "Z3"] * 25,
+            "DayOfWeek": ["Mon", "Tue"] * 50,
+            "Narrative": [f"note {i}" for i in range(n)],
+            "VictimAge": [25.0, np.nan, 200.0, 40.0] * 25,
+            "JuvDeaths_M": [0, 1] * 50,
+            "AdultDeaths_M": ["0", "unknown"] * 50,
+        }
+    )
+    with caplog.at_level(logging.INFO, logger="etl_scripts.dtype_optimizer"):
+        out = optimize_dtypes(df, exclude=("DayOfWeek",))
+
+    assert isinstance(out["PDZone"].dtype, pd.CategoricalDtype)
+    assert out["PDZone"].isna().sum() == 25
+    assert out["DayOfWeek"].dtype == object
+    assert out["CaseNumber"].dtype == object and out["Narrative"].dtype == object
+    assert str(out["VictimAge"].dtype) == "Int16"
+    assert out["VictimAge"].tolist()[:4] == [25, pd.NA, 200, 40]
+    assert str(out["JuvDeaths_M"].dtype) == "Int8"
+    assert out["AdultDeaths_M"].tolist()[:2] == ["0", "unknown"]  # not castable without losing values
+    assert "PDZone: object -> category" in caplog.text
+    assert "Dtype optimisation saved" in caplog.text
+
+
+def test_smallest_int_dtype() -> None:
+    assert smallest_int_dtype(pd.Series([1.5, 2.0])) is None
+    assert smallest_int_dtype(pd.Series([-129, 5])) == "Int16"
+    assert smallest_int_dtype(pd.Series([True, False])) == "Int8"
+    assert smallest_int_dtype(pd.Series([np.nan, np.nan])) == "Int8"
@@ -0,0 +1,529 @@
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time as time_module
+import zipfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+from openpyxl.utils.datetime import from_excel
+
+from etl_scripts import export_excel_sheets_to_csv as exporter
+
+
+def _args(**overrides) -> SimpleNamespace:
+    args = SimpleNamespace(
+        engine="auto",
+        chunksize=None,
+        include=[],
+        exclude=[],
+        include_empty=False,
+        visible_only=False,
+        all_sheets=True,
+        date_format="%Y-%m-%d",
+        datetime_format="%Y-%m-%d %H:%M:%S",
+        time_format="%H:%M:%S",
+        af_columns="A,B,C",
+        min_af_nonempty=0,
+        af_gate_visible_only=False,
+        encoding="utf-8",
+        bom=False,
+        disable_af_gate=True,
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+def _write_workbook(path: Path) -> Path:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Cases"
+    ws.append(["CaseNumber", "Incident Date", "Incident Time", "Officer"])
+    ws.append(["23-000001", datetime(2023, 1, 1), time(0, 30), "P.O. John Doe 123"])
+    ws.append(["23-000002", datetime(2023, 1, 2, 14, 22, 10), None, None])
+    ws.append([None, None, None, None])
+    ws.append(["23-000003", None, None, 7])
+    notes = wb.create_sheet("Notes")
+    notes.append(["Note"])
+    notes.append(["Follow-up"])
+    wb.save(path)
+    return path
+
+
+def _read_csv(path: str) -> list[list[str]]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        return list(csv.reader(fh))
+
+
+def test_openpyxl_streaming_export(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), _args(), logging.getLogger("test"))
+
+    assert result["success"]
+    sheets = {s["sheet_name"]: s for s in result["sheets"]}
+    assert sheets["Cases"]["rows"] == 4
+    assert sheets["Cases"]["cols"] == 4
+    rows = _read_csv(sheets["Cases"]["file"])
+    assert rows[0] == ["CaseNumber", "Incident Date", "Incident Time", "Officer"]
+    assert rows[1] == ["23-000001", "2023-01-01", "00:30:00", "P.O. John Doe 123"]
+    assert rows[2] == ["23-000002", "2023-01-02 14:22:10", "", ""]
+    assert rows[3] == ["23-000003", "", "", "7"]
+    assert _read_csv(sheets["Notes"]["file"]) == [["Note"], ["Follow-up"]]
+
+
+def test_openpyxl_streaming_af_gate(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+    args = _args(min_af_nonempty=2, include=["Cases"], all_sheets=False)
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), args, logging.getLogger("test"))
+
+    rows = _read_csv(result["sheets"][0]["file"])
+    assert [r[0] for r in rows] == ["CaseNumber", "23-000001", "23-000002"]
+
+
+def test_af_gate_mask_counts_selected_columns() -> None:
+    df = pd.DataFrame({"a": ["x", "", None, "y"], "b": [1, np.nan, 2, None], "c": ["z", "", "", pd.NA]})
+    assert exporter._af_gate_mask(df, [0, 1, 2, 9], 2).tolist() == [True, False, False, False]
+    assert exporter._af_gate_mask(df, [0, 1], 1).tolist() == [True, False, True, True]
+    assert exporter._af_gate_mask(df, [5], 1).tolist() == [False] * 4
+    assert exporter._af_gate_mask(df, [0], 0).all()
+
+
+def test_pandas_engine_af_gate_matches_streaming(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    args = _args(engine="pandas", min_af_nonempty=2, include=["Cases"], all_sheets=False)
+    result = exporter.process_excel_file(str(xlsx), str(tmp_path / "out"), args, logging.getLogger("test"))
+
+    rows = _read_csv(result["sheets"][0]["file"])
+    assert [r[0] for r in rows] == ["CaseNumber", "23-000001", "23-000002"]
+
+
+def test_pandas_engine_parses_workbook_once(tmp_path: Path, monkeypatch) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("pd.read_excel should not be called per sheet")
+
+    monkeypatch.setattr(exporter.pd, "read_excel", _fail)
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), _args(engine="pandas"), logging.getLogger("test"))
+
+    sheets = {s["sheet_name"]: s for s in result["sheets"]}
+    assert set(sheets) == {"Cases", "Notes"}
+    assert _read_csv(sheets["Cases"]["file"])[0] == ["CaseNumber", "Incident Date", "Incident Time", "Officer"]
+    assert _read_csv(sheets["Notes"]["file"]) == [["Note"], ["Follow-up"]]
+
+
+def test_parallel_export_is_deterministic(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_workbook(src / "a_cases.xlsx")
+    _write_workbook(src / "b_cases.xlsx")
+    out_dir = tmp_path / "out"
+
+    exporter.main(src, out_dir, workers=2)
+
+    summary = json.loads((out_dir / "conversion_summary.json").read_text(encoding="utf-8"))
+    assert summary["successful_conversions"] == 2
+    files = [[Path(s["file"]).name for s in r["sheets"]] for r in summary["files_processed"]]
+    assert files == [["Cases.csv", "Notes.csv"], ["Cases_2.csv", "Notes_2.csv"]]
+
+
+def test_incremental_export_reuses_unchanged_workbooks(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_workbook(src / "a_cases.xlsx")
+    _write_workbook(src / "b_cases.xlsx")
+    out_dir = tmp_path / "out"
+
+    exporter.main(src, out_dir)
+    assert (out_dir / exporter.MANIFEST_NAME).exists()
+
+    wb = Workbook()
+    wb.active.append(["Only"])
+    wb.save(src / "b_cases.xlsx")
+    exporter.main(src, out_dir)
+
+    summary = json.loads((out_dir / "conversion_summary.json").read_text(encoding="utf-8"))
+    first, second = summary["files_processed"]
+    assert first.get("cached") is True
+    assert [Path(s["file"]).name for s in first["sheets"]] == ["Cases.csv", "Notes.csv"]
+    assert not second.get("cached")
+    assert summary["cached_files"] == 1
+
+    exporter.main(src, out_dir, use_cache=False)
+    summary = json.loads((out_dir / "conversion_summary.json").read_text(encoding="utf-8"))
+    assert summary["cached_files"] == 0
+    # Chunking changes pandas-engine headers, so it is part of the cache key
+    assert exporter._export_settings_hash(_args(chunksize=2)) != exporter._export_settings_hash(_args())
+
+
+def test_manifest_keeps_other_workbooks_and_checks_outputs(tmp_path: Path) -> None:
+    a, b = str(_write_workbook(tmp_path / "a_cases.xlsx")), str(_write_workbook(tmp_path / "b_cases.xlsx"))
+    out_dir = str(tmp_path / "out")
+    log = logging.getLogger("test")
+    exporter.export_workbooks([a, b], out_dir, _args(), log)
+
+    # A single-workbook run (as with --xlsx) leaves the other workbook's entry alone
+    assert exporter.export_workbooks([a], out_dir, _args(), log)[0].get("cached") is True
+    assert len(exporter.load_export_manifest(out_dir)) == 2
+
+    # An edited output of the same size no longer counts as a cache hit
+    edited = Path(out_dir) / "Notes_2.csv"
+    data = edited.read_bytes()
+    edited.write_bytes(data.replace(b"Follow-up", b"Follow-UP"))
+    results = exporter.export_workbooks([a, b], out_dir, _args(), log)
+    assert [bool(r.get("cached")) for r in results] == [True, False]
+    assert _read_csv(edited)[-1] == ["Follow-up"]
+
+def test_format_column_matches_per_cell_formatting() -> None:
+    df = pd.DataFrame(
+        {
+            "dt": [datetime(2023, 1, 1), datetime(1899, 12, 30, 5, 6, 7), datetime(2023, 1, 2, 3, 4, 5), pd.NaT],
+            "td": [pd.Timedelta(seconds=90061), pd.Timedelta(seconds=-5), pd.NaT, pd.Timedelta(0)],
+            "num": [1.0, np.nan, 2.5, 3],
+            "text": ["a", "7:05", "", "x"],
+            "mixed": [time(1, 2, 3), "12:30", 5, None],
+        }
+    )
+    for col in df.columns:
+        formatted = exporter._format_column(df[col], "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%H:%M:%S")
+        assert list(formatted) == [exporter._to_text(v) for v in df[col].tolist()], col
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "pandas"])
+def test_parquet_export_keeps_types(tmp_path: Path, engine: str) -> None:
+    pytest.importorskip("pyarrow")
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+    args = _args(engine=engine, output_format="parquet")
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), args, logging.getLogger("test"))
+
+    sheets = {s["sheet_name"]: s for s in result["sheets"]}
+    cases = sheets["Cases"]
+    assert cases["file"].endswith("Cases.parquet")
+    assert cases["rows"] == 3
+    assert cases["file_sha256"]
+
+    df = pd.read_parquet(cases["file"])
+    assert list(df.columns) == ["CaseNumber", "Incident Date", "Incident Time", "Officer"]
+    assert pd.api.types.is_datetime64_any_dtype(df["Incident Date"])
+    assert df["Incident Date"].iloc[1] == pd.Timestamp(2023, 1, 2, 14, 22, 10)
+    assert df["CaseNumber"].tolist() == ["23-000001", "23-000002", "23-000003"]
+
+
+def test_csv_digest_computed_while_writing(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), _args(bom=True), logging.getLogger("test"))
+
+    for sheet in result["sheets"]:
+        data = Path(sheet["file"]).read_bytes()
+        assert data.startswith(b"\xef\xbb\xbf")
+        assert sheet["bytes"] == len(data)
+        assert sheet["file_sha256"] == hashlib.sha256(data).hexdigest()
+
+
+def test_chunked_export_matches_single_block(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    whole = exporter.process_excel_file(str(xlsx), str(tmp_path / "whole"), _args(), logging.getLogger("test"))
+    chunked = exporter.process_excel_file(
+        str(xlsx), str(tmp_path / "chunked"), _args(engine="pandas", chunksize=2), logging.getLogger("test")
+    )
+
+    for a, b in zip(whole["sheets"], chunked["sheets"]):
+        assert b["chunksize"] == 2
+        assert b["peak_rss_mb"] > 0
+        assert a["file_sha256"] == b["file_sha256"]
+
+
+def test_sheet_records_carry_throughput_metrics(tmp_path: Path, capsys) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    args = _args(engine="iterparse", progress=True, sheet_timeout=0)
+    result = exporter.process_excel_file(str(xlsx), str(tmp_path / "out"), args, logging.getLogger("test"))
+
+    for sheet in result["sheets"]:
+        assert sheet["parse_seconds"] >= 0
+        assert sheet["write_seconds"] >= 0
+        assert sheet["rows_per_sec"] > 0
+        assert sheet["bytes"] == Path(sheet["file"]).stat().st_size
+        assert sheet["peak_rss_mb"] > 0
+    assert "Cases" in capsys.readouterr().err
+
+
+def test_adaptive_chunksize_respects_memory() -> None:
+    assert exporter.get_adaptive_chunksize(1024, 8192) == 10000
+    assert exporter.get_adaptive_chunksize(1024, 8192, n_cols=20) == 10000
+    assert exporter.get_adaptive_chunksize(1024, 10, n_cols=1000) == 100
+    assert exporter.get_adaptive_chunksize(200 * 1024 * 1024, 8192, n_cols=20) == 1000
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="patched writer must be inherited by the worker")
+def test_sheet_timeout_kills_worker_and_removes_partial_output(tmp_path: Path, monkeypatch) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    out_dir = tmp_path / "out"
+    real_writer = exporter._stream_write_csv
+
+    def _slow_writer(path, rows, encoding, bom, stats=None, compression=None):
+        if Path(path).name.startswith("Cases.csv"):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text("partial", encoding="utf-8")
+            time_module.sleep(30)
+        return real_writer(path, rows, encoding, bom, stats, compression)
+
+    monkeypatch.setattr(exporter, "_stream_write_csv", _slow_writer)
+    started = time_module.monotonic()
+    result = exporter.process_excel_file(str(xlsx), str(out_dir), _args(sheet_timeout=1), logging.getLogger("test"))
+
+    assert time_module.monotonic() - started < 15
+    sheets = {s["sheet_name"]: s for s in result["sheets"]}
+    assert sheets["Cases"]["status"] == "error"
+    assert "timed out" in sheets["Cases"]["error"]
+    assert not (out_dir / "Cases.csv").exists()
+    assert not list(out_dir.glob("*.part"))
+    assert _read_csv(sheets["Notes"]["file"]) == [["Note"], ["Follow-up"]]
+
+
+def test_failed_worker_restart_reports_original_error(tmp_path: Path, monkeypatch) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    started = []
+
+    class _StuckWorker:
+        def __init__(self, xlsx_path, args, timeout):
+            if started:
+                raise exporter.ExportTimeoutError("Worker start timed out")
+            started.append(self)
+            self.sheet_names = ["Cases", "Notes"]
+
+        def export_sheet(self, sheet_name, out_path):
+            raise exporter.ExportTimeoutError("Export timed out after 1 seconds")
+
+        def kill(self):
+            pass
+
+        close = kill
+
+    monkeypatch.setattr(exporter, "_SheetWorker", _StuckWorker)
+    result = exporter.process_excel_file(
+        str(xlsx), str(tmp_path / "out"), _args(sheet_timeout=1), logging.getLogger("test")
+    )
+
+    assert [(s["sheet_name"], s["error"]) for s in result["sheets"]] == [
+        ("Cases", "Export timed out after 1 seconds"),
+        ("Notes", "Worker start timed out"),
+    ]
+
+
+def test_iterparse_engine_matches_openpyxl(tmp_path: Path) -> None:
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    wb = load_workbook(xlsx)
+    ws = wb["Cases"]
+    ws.append([1, 2.5, True, datetime(1900, 1, 15), timedelta(hours=30), "12:05"])
+    ws.append([10**12, None, False, date(2024, 2, 29), time(23, 59, 59), None])
+    wb.save(xlsx)
+
+    expected = exporter.process_excel_file(str(xlsx), str(tmp_path / "a"), _args(), logging.getLogger("test"))
+    actual = exporter.process_excel_file(str(xlsx), str(tmp_path / "b"), _args(engine="iterparse"), logging.getLogger("test"))
+
+    assert [s["sheet_name"] for s in actual["sheets"]] == ["Cases", "Notes"]
+    for a, b in zip(expected["sheets"], actual["sheets"]):
+        assert _read_csv(a["file"]) == _read_csv(b["file"])
+
+
+def test_from_excel_serials_matches_openpyxl() -> None:
+    serials = [0.5, 1.0, 59.0, 61.25, 45000.999999, 0.9999999]
+    expected = [from_excel(v) for v in serials]
+    assert list(exporter._from_excel_serials(serials)) == expected
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "iterparse"])
+def test_phantom_range_is_trimmed(tmp_path: Path, engine: str) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "RMS"
+    ws.append(["Case", "Officer"])
+    ws.append(["23-000001", "Doe"])
+    ws.append(["23-000002", None, None, "late"])
+    for r in range(1, 500):
+        ws.cell(row=r, column=40).font = Font(bold=True)
+    wb.save(tmp_path / "rms.xlsx")
+
+    result = exporter.process_excel_file(
+        str(tmp_path / "rms.xlsx"), str(tmp_path / "out"), _args(engine=engine, chunksize=2), logging.getLogger("test")
+    )
+
+    sheet = result["sheets"][0]
+    assert sheet["declared_range"] == "A1:AN499"
+    assert sheet["used_range"] == "A1:D3"
+    assert sheet["cols"] == 4
+    rows = _read_csv(sheet["file"])
+    assert rows == [["Case", "Officer", "", ""], ["23-000001", "Doe", "", ""], ["23-000002", "", "", "late"]]
+    assert sheet["file_sha256"] == hashlib.sha256(Path(sheet["file"]).read_bytes()).hexdigest()
+
+
+def test_used_extent_comes_from_the_streamed_rows(tmp_path: Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Case", "Officer"])
+    ws.append(["23-000001", None, None, "late"])
+    for r in range(1, 500):
+        ws.cell(row=r, column=40).font = Font(bold=True)
+    wb.save(tmp_path / "rms.xlsx")
+
+    ws = load_workbook(tmp_path / "rms.xlsx", read_only=True).active
+    extent = {"rows": 0, "cols": 0}
+    rows = list(exporter._iter_used_rows(ws, extent))
+    assert [len(row) for row in rows] == [2, 4]
+    assert exporter.get_used(ws, extent) == (2, 4)
+    # The worksheet keeps its declared dimension, and get_used alone doesn't scan it
+    assert ws.calculate_dimension() == "A1:AN499"
+    assert exporter.get_used(ws) == (499, 40)
+
+
+def _write_hidden_workbook(path: Path) -> Path:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "DV"
+    ws.append(["Case", "Scratch", "Officer"])
+    ws.append(["23-000001", "tmp", "Doe"])
+    ws.append(["23-000002", "tmp", None])
+    ws.append(["23-000003", None, "Roe"])
+    ws.row_dimensions[3].hidden = True
+    ws.column_dimensions["B"].hidden = True
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "iterparse", "pandas"])
+def test_visible_only_drops_hidden_rows_and_columns(tmp_path: Path, engine: str) -> None:
+    xlsx = _write_hidden_workbook(tmp_path / "dv.xlsx")
+    result = exporter.process_excel_file(
+        str(xlsx), str(tmp_path / "out"), _args(engine=engine, visible_only=True), logging.getLogger("test")
+    )
+
+    rows = _read_csv(result["sheets"][0]["file"])
+    assert rows == [["Case", "Officer"], ["23-000001", "Doe"], ["23-000003", "Roe"]]
+    # The used range describes the sheet, hidden rows included, whichever engine read it
+    assert result["sheets"][0]["used_range"] == "A1:C4"
+
+
+def test_af_gate_visible_only_ignores_hidden_cells(tmp_path: Path) -> None:
+    xlsx = _write_hidden_workbook(tmp_path / "dv.xlsx")
+    args = _args(af_columns="A-C", min_af_nonempty=2, af_gate_visible_only=True)
+    result = exporter.process_excel_file(str(xlsx), str(tmp_path / "out"), args, logging.getLogger("test"))
+
+    rows = _read_csv(result["sheets"][0]["file"])
+    assert rows == [["Case", "Scratch", "Officer"], ["23-000001", "tmp", "Doe"], ["23-000003", "", "Roe"]]
+
+
+def test_sheet_visibility_scans_row_and_col_tags(tmp_path: Path) -> None:
+    xlsx = _write_hidden_workbook(tmp_path / "dv.xlsx")
+    ws = load_workbook(xlsx)["DV"]
+    ws.column_dimensions.group("D", "F", hidden=True)
+    ws.row_dimensions[7].hidden = True
+    ws.parent.save(xlsx)
+
+    with zipfile.ZipFile(xlsx) as zf:
+        hidden_rows, hidden_cols = exporter._sheet_visibility(zf, exporter._sheet_parts(zf)["DV"])
+    assert hidden_rows.tolist() == [3, 7]
+    assert hidden_cols.tolist() == [1, 3, 4, 5]
+
+
+def test_resume_after_sigterm_skips_finished_sheets(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_workbook(src / "a_cases.xlsx")
+    _write_workbook(src / "b_cases.xlsx")
+    out_dir = tmp_path / "out"
+    real_export = exporter._WorkbookSource._export_sheet
+    calls = []
+
+    def _export(self, sheet_name, out_path):
+        calls.append((Path(self.xlsx_path).name, sheet_name))
+        if calls[-1] == ("b_cases.xlsx", "Notes") and len(calls) == 4:
+            Path(out_path).write_text("partial", encoding="utf-8")
+            os.kill(os.getpid(), signal.SIGTERM)
+        return real_export(self, sheet_name, out_path)
+
+    monkeypatch.setattr(exporter._WorkbookSource, "_export_sheet", _export)
+    with pytest.raises(KeyboardInterrupt):
+        exporter.main(src, out_dir, sheet_timeout=0)
+
+    journal = (out_dir / exporter.JOURNAL_NAME).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["sheet"] for line in journal] == ["Cases", "Notes", "Cases"]
+    assert not (out_dir / "Notes_2.csv").exists()
+    assert not list(out_dir.glob("*.part"))
+
+    exporter.main(src, out_dir, sheet_timeout=0, resume=True)
+
+    assert calls[4:] == [("b_cases.xlsx", "Notes")]
+    summary = json.loads((out_dir / "conversion_summary.json").read_text(encoding="utf-8"))
+    first, second = summary["files_processed"]
+    assert all(s["resumed"] for s in first["sheets"])
+    assert [s.get("resumed", False) for s in second["sheets"]] == [True, False]
+    assert (out_dir / "Notes_2.csv").read_text(encoding="utf-8-sig").splitlines() == ["Note", "Follow-up"]
+    assert not (out_dir / exporter.JOURNAL_NAME).exists()
+
+
+@pytest.mark.parametrize("codec,suffix", [("gzip", ".csv.gz"), ("zstd", ".csv.zst")])
+def test_compressed_csv_export_round_trips(tmp_path: Path, codec: str, suffix: str) -> None:
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    from etl_scripts import tabular_io
+
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    plain = exporter.process_excel_file(str(xlsx), str(tmp_path / "plain"), _args(), logging.getLogger("test"))
+    packed = exporter.process_excel_file(
+        str(xlsx), str(tmp_path / "packed"), _args(compress=codec, chunksize=2), logging.getLogger("test")
+    )
+
+    for a, b in zip(plain["sheets"], packed["sheets"]):
+        assert b["file"].endswith(suffix)
+        assert b["compression"] == codec
+        data = Path(b["file"]).read_bytes()
+        assert b["bytes"] == len(data)
+        assert b["file_sha256"] == hashlib.sha256(data).hexdigest()
+        pd.testing.assert_frame_equal(tabular_io.read_tabular(b["file"]), tabular_io.read_tabular(a["file"]))
+
+
+def test_compressed_exports_are_found_downstream(tmp_path: Path, monkeypatch) -> None:
+    from etl_scripts import fix_dv_headers, tabular_io
+
+    for name in ("a_dv.csv.gz", "b_dv.csv", "c_dv.csv.zst", "d_dv.csv.part", "e_dv.json"):
+        (tmp_path / name).write_bytes(b"")
+    assert [p.name for p in tabular_io.glob_csv(tmp_path, "*dv")] == ["a_dv.csv.gz", "b_dv.csv", "c_dv.csv.zst"]
+    assert tabular_io.find_csv(tmp_path / "a_dv.csv") == tmp_path / "a_dv.csv.gz"
+    assert tabular_io.find_csv(tmp_path / "b_dv.csv") == tmp_path / "b_dv.csv"
+    assert tabular_io.find_csv(tmp_path / "x_dv.csv") == tmp_path / "x_dv.csv"
+    assert tabular_io.tabular_stem(Path("x.csv.gz")) == "x"
+
+    src = tmp_path / "cases.csv.gz"
+    pd.DataFrame({"CaseNumber": ["23-000001"]}).to_csv(src, index=False)
+    monkeypatch.chdir(tmp_path)
+    fix_dv_headers.process_dv_file(src)
+    assert (tmp_path / "processed_data" / "cases_fixed.csv").exists()
+
+
+def test_zstd_falls_back_to_gzip_without_zstandard(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(exporter, "_zstandard", lambda: None)
+    xlsx = _write_workbook(tmp_path / "cases.xlsx")
+    result = exporter.process_excel_file(
+        str(xlsx), str(tmp_path / "out"), _args(compress="zstd", sheet_timeout=0), logging.getLogger("test")
+    )
+
+    assert [Path(s["file"]).name for s in result["sheets"]] == ["Cases.csv.gz", "Notes.csv.gz"]
+    with gzip.open(result["sheets"][1]["file"], "rt", encoding="utf-8", newline="") as fh:
+        assert list(csv.reader(fh)) == [["Note"], ["Follow-up"]]
@@ -7,3 +7,68 @@ def test_yes_no_to_bool_mapping() -> None:
     mapped = df["YN"].str.lower().isin(["y", "yes", "true", "t", "1"])
     assert mapped.tolist() == [True, False, True, False, True, False]
 
+
+
+def test_collapse_one_hot_first_flag_wins_with_bitmask() -> None:
+    from etl_scripts.transform_dv_data import collapse_one_hot
+
+    df = pd.DataFrame(
+        {
+            "VictimRace_W": ["X", None, True, " o ", ""],
+            "VictimRace_B": [None, "x", "X", None, "N"],
+            "Other": [1, 2, 3, 4, 5],
+        }
+    )
+    out = collapse_one_hot(
+        df, {"VictimRace_W": "W", "VictimRace_B": "B"}, "VictimRace", {"X", "O", "TRUE"}
+    )
+    assert isinstance(out["VictimRace"].dtype, pd.CategoricalDtype)
+    assert out["VictimRace"].cat.categories.tolist() == ["W", "B"]
+    assert out["VictimRace"].cat.codes.tolist() == [0, 1, 0, 0, -1]
+    assert out["VictimRaceFlags"].tolist() == [1, 2, 3, 1, 0]
+    assert list(out.columns) == ["Other", "VictimRace", "VictimRaceFlags"]
+
+
+def test_consolidate_day_of_week_uses_mapping_csv() -> None:
+    from etl_scripts.transform_dv_data import consolidate_day_of_week
+
+    df = pd.DataFrame({"Monday": [None, "X"], "Friday": ["O", None]})
+    out = consolidate_day_of_week(df)
+    assert out["DayOfWeek"].tolist() == ["Fri", "Mon"]
+
+    from etl_scripts.transform_dv_data import DAY_OF_WEEK_FILE, load_one_hot_groups
+
+    assert load_one_hot_groups(DAY_OF_WEEK_FILE)["day_of_week"]["Monday"] == "Mon"
+    assert "day_of_week" not in load_one_hot_groups()
+
+
+def test_mapping_registry_reloads_only_on_content_change(tmp_path) -> None:
+    import os
+
+    from etl_scripts import mapping_registry
+
+    path = tmp_path / "yes_no.csv"
+    path.write_text("raw,normalized,boolean\nY,Yes,True\nN,No,False\n")
+    first = mapping_registry.yes_no_vocab(path)
+    assert first.truthy == frozenset({"Y"})
+    assert mapping_registry.yes_no_vocab(path) is first
+
+    # Touched but unchanged: same cached object
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert mapping_registry.yes_no_vocab(path) is first
+
+    path.write_text("raw,normalized,boolean\nX,True,True\nN,No,False\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert mapping_registry.yes_no_vocab(path).truthy == frozenset({"X"})
+
+    path.unlink()
+    assert mapping_registry.yes_no_vocab(path) is None
+
+
+def test_boolean_vocab_map_series() -> None:
+    from etl_scripts.mapping_registry import BooleanVocab
+
+    vocab = BooleanVocab(frozenset({"X", "O"}), frozenset({"0", ""}))
+    mapped = vocab.map_series(pd.Series([" x", None, "0", "O", "maybe", ""]))
+    assert mapped.tolist() == [True, False, False, True, "maybe", False]
@@ -22,3 +22,80 @@ def test_date_cascade_falls_back_to_report_date() -> None:
     c = datetime(2025, 11, 6)
     assert _cascade(None, None, c) == c
 
+
+
+def test_format_time_columns_hms_strings() -> None:
+    import pandas as pd
+
+    from etl_scripts.transform_dv_data import format_time_columns
+
+    df = pd.DataFrame(
+        {
+            "Time": pd.Series(["00:30:00", None, "invalid", pd.Timedelta(hours=123, seconds=5)], dtype=object),
+            "TotalTime": pd.to_timedelta(["1:02:03", None, "0:00:59.9", "26:00:00"]),
+        }
+    )
+    out = format_time_columns(df)
+    assert out["Time"].tolist() == ["00:30:00", pd.NA, pd.NA, "123:00:05"]
+    assert out["TotalTime"].tolist() == ["01:02:03", pd.NA, "00:00:59", "26:00:00"]
+    assert str(out["Time"].dtype) == "string"
+    assert format_time_columns(pd.DataFrame({"Time": pd.Series([], dtype=object)}))["Time"].empty
+
+
+def test_format_time_columns_time_objects_and_coarse_resolution() -> None:
+    from datetime import time
+
+    import pandas as pd
+
+    from etl_scripts.transform_dv_data import format_time_columns
+
+    df = pd.DataFrame(
+        {
+            # pyarrow's CSV reader types HH:MM:SS cells as datetime.time
+            "TotalTime": pd.Series([time(0, 45), None, time(23, 59, 59)], dtype=object),
+            "Time": pd.to_timedelta(["00:30:00", None, "12:00:01"]).astype("timedelta64[s]"),
+        }
+    )
+    out = format_time_columns(df)
+    assert out["TotalTime"].tolist() == ["00:45:00", pd.NA, "23:59:59"]
+    assert out["Time"].tolist() == ["00:30:00", pd.NA, "12:00:01"]
+    micro = pd.Series(pd.to_timedelta(["01:02:03.5"]).astype("timedelta64[us]"))
+    assert format_time_columns(pd.DataFrame({"Time": micro}))["Time"].tolist() == ["01:02:03"]
+
+
+def test_parse_dates_sniffs_format_and_counts_unparseable() -> None:
+    import pandas as pd
+
+    from etl_scripts.transform_dv_data import parse_dates
+
+    raw = pd.Series(["01/05/2023", "01/05/2023", None, "", "bad", "2023-01-07", "01/06/2023 14:22"])
+    parsed, unparseable = parse_dates(raw)
+    assert unparseable == 1
+    assert str(parsed.dtype) == "datetime64[ns, America/New_York]"
+    assert [str(v.date()) if not pd.isna(v) else None for v in parsed] == [
+        "2023-01-05",
+        "2023-01-05",
+        None,
+        None,
+        None,
+        "2023-01-07",
+        "2023-01-06",
+    ]
+    assert parsed.iloc[6].hour == 14
+
+
+def test_fix_offense_date_column_parses_off_format_values() -> None:
+    import pandas as pd
+
+    from etl_scripts.transform_dv_data import fix_offense_date_column
+
+    # The first value's format is the odd one out; it must not decide the parse
+    df = pd.DataFrame({"c": ["2023-01-05", "01/06/2023", "01/07/2023", None, "01/08/2023"]})
+    out = fix_offense_date_column(df)
+    assert [str(d) if not pd.isna(d) else None for d in out["OffenseDate"]] == [
+        "2023-01-05",
+        "2023-01-06",
+        "2023-01-07",
+        None,
+        "2023-01-08",
+    ]
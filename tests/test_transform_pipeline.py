@@ -0,0 +1,90 @@
+import json
+
+import pandas as pd
+import pytest
+
+from etl_scripts import transform_dv_data
+
+
+def test_process_dv_file_reports_steps_and_honours_skip(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(transform_dv_data, "RMS_EXPORT_PATH", tmp_path / "missing_rms.csv")
+    monkeypatch.setattr(transform_dv_data, "CAD_EXPORT_PATH", tmp_path / "missing_cad.csv")
+    src = tmp_path / "dv_fixed.csv"
+    pd.DataFrame(
+        {
+            "CaseNumber": ["23-000001", "23-000002"],
+            "c": ["01/05/2023", "01/06/2023"],
+            "VictimRace_W": ["X", None],
+            "VictimRace_B": [None, "X"],
+            "Municipality": ["Hackensack", "Hackensack"],
+            "Time": ["00:30:00", None],
+            "JuvDeaths_M": [0, 1],
+        }
+    ).to_csv(src, index=False)
+    out = tmp_path / "dv_transformed.csv"
+
+    df = transform_dv_data.process_dv_file(src, out, skip_steps=["drop_municipality_columns"])
+
+    assert "Municipality" in df.columns
+    assert df["VictimRace"].tolist() == ["W", "B"]
+    assert df["Time"].tolist() == ["00:30:00", pd.NA]
+    assert str(df["JuvDeaths_M"].dtype) == "boolean"
+    report = json.loads((tmp_path / "dv_transformed_steps.json").read_text())
+    expected = [name for name in transform_dv_data.STEP_NAMES if name != "drop_municipality_columns"]
+    assert [entry["step"] for entry in report] == expected
+    race = report[expected.index("consolidate_victim_race")]
+    assert (race["rows_in"], race["rows_out"]) == (2, 2)
+    assert race["cols_out"] == race["cols_in"] - 2 + 2  # two flags -> VictimRace + VictimRaceFlags
+    assert all(entry["seconds"] >= 0 for entry in report)
+
+    with pytest.raises(ValueError, match="Unknown transform step"):
+        transform_dv_data.resolve_steps(["no_such_step"])
+    assert transform_dv_data.resolve_steps(["format_time_columns", "rename_sex_columns"]) == [
+        transform_dv_data.format_time_columns,
+        transform_dv_data.rename_sex_columns,
+    ]
+
+
+def test_chunked_transform_matches_full_run(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(transform_dv_data, "RMS_EXPORT_PATH", tmp_path / "rms.csv")
+    monkeypatch.setattr(transform_dv_data, "CAD_EXPORT_PATH", tmp_path / "missing_cad.csv")
+    pd.DataFrame(
+        [["23-000002", "2023-01-06", "14:22:10"]], columns=["Case Number", "Incident Date", "Incident Time"]
+    ).to_csv(tmp_path / "rms.csv", index=False)
+    src = tmp_path / "dv_fixed.csv"
+    # The first block holds only one date format; later blocks mix in others, plus
+    # HH:MM times and a TotalTime column
+    dates = ["2023-01-05", None, "2023-01-07", "01/08/2023", None, "01/10/2023", "11-Jan-2023", "01/12/2023", "bad"]
+    times = ["00:30:00", None, "12:00", None, "01:02:03", "7:05", "23:59:59", "bad", "09:15"]
+    pd.DataFrame(
+        {
+            "CaseNumber": [f"23-{i:06d}" for i in range(9)],
+            "c": dates,
+            "VictimRace_W": ["X", None, None, "X", None, "X", None, None, "X"],
+            "VictimRace_B": [None, "X", "X", "X", None, None, "X", None, None],
+            "Sunday": ["X", None, None, None, "X", None, None, "X", None],
+            "Monday": [None, "X", "X", "X", None, "X", "X", None, None],
+            "Time": times,
+            "TotalTime": ["00:45:00", "1:30", None, "00:45:00", None, "2:00", None, None, "0:05"],
+            "VictimAge": ["25", None, "40", "31", None, "19", "60", None, "25"],
+            "JuvDeaths_M": [0, 1, 0, None, 0, 0, 1, 0, 0],
+        }
+    ).to_csv(src, index=False)
+
+    full = tmp_path / "full.csv"
+    transform_dv_data.process_dv_file(src, full)
+    full_frame = pd.read_csv(full)
+    assert full_frame["OffenseDate"].notna().sum() == 6  # every format except "bad"
+    assert full_frame["Time"].fillna("").tolist() == [
+        "00:30:00", "", "12:00:00", "", "01:02:03", "07:05:00", "23:59:59", "", "09:15:00"
+    ]
+    assert full_frame["TotalTime"].notna().sum() == 5
+
+    for chunksize in (2, 3, 4):
+        chunked = tmp_path / f"chunked_{chunksize}.csv"
+        assert transform_dv_data.process_dv_file(src, chunked, chunksize=chunksize) is None
+        assert chunked.read_text() == full.read_text(), chunksize
+    assert not list(tmp_path.glob("*.part"))
+    report = json.loads((tmp_path / "chunked_3_steps.json").read_text())
+    assert {entry["chunks"] for entry in report} == {3}
+    assert report[0]["rows_in"] == 9